@@ -66,7 +66,8 @@ pytest tests/unit -v --cov=src --cov-report=term-missing --cov-report=html
 
 # Run integration tests
 echo "🔗 Running integration tests..."
-pytest tests/integration -v --cov=src --cov-append
+# Each test class runs on one worker so class-level setup isn't repeated
+pytest tests/integration -v -n auto --dist=loadscope --cov=src --cov-append
 
 # Check coverage threshold
 echo "📊 Checking coverage threshold..."
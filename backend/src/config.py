@@ -82,6 +82,10 @@ class Settings(BaseSettings):
     # Monitoring and logging
     log_level: str = Field(default="INFO", description="Logging level")
     sentry_dsn: Optional[str] = Field(default=None, description="Sentry DSN for error tracking")
+    monitor_track_active_requests: bool = Field(
+        default=False,
+        description="Keep per-request details of in-flight requests for introspection"
+    )
     
     # Server settings
     host: str = Field(default="0.0.0.0", description="Server host")
@@ -232,7 +232,47 @@ class FirestoreService:
                 message="Failed to update document",
                 details=[str(e)]
             )
-    
+
+    async def patch_document(
+        self,
+        collection: str,
+        document_id: str,
+        updates: Dict[str, Any]
+    ) -> None:
+        """Update only the given fields of an existing document in a single call.
+
+        Firestore's update() requires the document to exist, so a missing
+        document surfaces as NotFoundError without a prior read.
+        """
+        try:
+            doc_ref = self.client.collection(collection).document(document_id)
+            doc_ref.update(updates)
+
+            logger.info(
+                "Document patched",
+                collection=collection,
+                document_id=document_id,
+                fields=list(updates.keys())
+            )
+
+        except gcp_exceptions.NotFound:
+            raise NotFoundError(
+                message=f"Document {document_id} not found",
+                resource_type="document",
+                resource_id=document_id
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to patch document",
+                collection=collection,
+                document_id=document_id,
+                error=str(e)
+            )
+            raise DatabaseError(
+                message="Failed to update document",
+                details=[str(e)]
+            )
+
     async def delete_document(
         self,
         collection: str,
@@ -17,7 +17,7 @@ from src.routers import health, auth, accounts, categories, transactions, import
 from src.middleware.error_handler import ErrorHandlerMiddleware
 from src.middleware.logging import LoggingMiddleware
 from src.middleware.security import SecurityHeadersMiddleware, RateLimitingMiddleware as SimpleLimiter
-from src.middleware.monitoring import MonitoringMiddleware
+from src.middleware.monitoring import MonitoringMiddleware, cleanup_health_http_client
 from src.middleware.rate_limiting import RateLimitingMiddleware as AdvancedLimiter
 from src.utils.exceptions import AppException
 from src.infrastructure import cleanup_firestore
@@ -66,6 +66,11 @@ async def lifespan(app: FastAPI):
         debug=settings.debug
     )
     
+    if settings.is_testing:
+        # Tests provide mocked services and never open real connections
+        yield
+        return
+    
     # Initialize services on startup
     logger.info("Initializing services...")
     
@@ -86,6 +91,7 @@ async def lifespan(app: FastAPI):
     
     # Cleanup resources
     await cleanup_firestore()
+    await cleanup_health_http_client()
     logger.info("Resources cleaned up")
 
 
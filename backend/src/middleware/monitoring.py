@@ -1,8 +1,12 @@
 """
 Advanced monitoring and observability middleware for Financial Nomad.
 """
+import copy
+import itertools
+import os
+import re
+import secrets
 import time
-import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional
 import asyncio
@@ -10,9 +14,12 @@ import asyncio
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, Gauge, generate_latest, multiprocess, CONTENT_TYPE_LATEST
+)
 
 from ..config import get_settings
+from ..utils.http import HTTP2_AVAILABLE
 
 logger = structlog.get_logger()
 
@@ -29,9 +36,13 @@ REQUEST_DURATION = Histogram(
     ['method', 'endpoint']
 )
 
+# Gauge multiprocess modes only apply when PROMETHEUS_MULTIPROC_DIR is set:
+# in-flight requests add up across workers, while the session count is a
+# total that any worker may set
 ACTIVE_REQUESTS = Gauge(
     'financial_nomad_active_requests',
-    'Number of active HTTP requests'
+    'Number of active HTTP requests',
+    multiprocess_mode='livesum'
 )
 
 DATABASE_OPERATIONS = Counter(
@@ -55,7 +66,8 @@ CACHE_OPERATIONS = Counter(
 # Application metrics
 USER_SESSIONS = Gauge(
     'financial_nomad_active_user_sessions',
-    'Number of active user sessions'
+    'Number of active user sessions',
+    multiprocess_mode='livemax'
 )
 
 BACKUP_OPERATIONS = Counter(
@@ -70,6 +82,21 @@ EXPORT_OPERATIONS = Counter(
     ['format', 'type', 'status']
 )
 
+# Request IDs are a per-process random nonce plus a counter: unique across the
+# deployment without an os.urandom() syscall on every request
+_PROCESS_NONCE = secrets.token_hex(8)
+_request_counter = itertools.count(1)
+
+# Common patterns for path normalization, compiled once rather than per request
+_ENDPOINT_PATTERNS = [
+    (re.compile(r'/api/v1/transactions/[^/]+'), '/api/v1/transactions/{id}'),
+    (re.compile(r'/api/v1/accounts/[^/]+'), '/api/v1/accounts/{id}'),
+    (re.compile(r'/api/v1/categories/[^/]+'), '/api/v1/categories/{id}'),
+    (re.compile(r'/api/v1/budgets/[^/]+'), '/api/v1/budgets/{id}'),
+    (re.compile(r'/api/v1/backup/exports/[^/]+'), '/api/v1/backup/exports/{id}'),
+    (re.compile(r'/api/v1/asana/tasks/[^/]+'), '/api/v1/asana/tasks/{id}'),
+]
+
 
 class MonitoringMiddleware(BaseHTTPMiddleware):
     """Middleware for request monitoring and observability."""
@@ -78,10 +105,13 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.settings = settings or get_settings()
         self.active_requests: Dict[str, Dict[str, Any]] = {}
+        # The in-flight count is always available from the ACTIVE_REQUESTS gauge;
+        # per-request details cost a URL render and dict churn, so they're opt-in
+        self.track_active_requests = self.settings.monitor_track_active_requests
     
     async def dispatch(self, request: Request, call_next):
         # Generate request ID for tracing
-        request_id = str(uuid.uuid4())
+        request_id = f"{_PROCESS_NONCE}-{next(_request_counter):x}"
         request.state.request_id = request_id
         
         # Start timing
@@ -89,12 +119,13 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         ACTIVE_REQUESTS.inc()
         
         # Store request info for monitoring
-        self.active_requests[request_id] = {
-            'method': request.method,
-            'url': str(request.url),
-            'start_time': start_time,
-            'user_id': getattr(request.state, 'user_id', None)
-        }
+        if self.track_active_requests:
+            self.active_requests[request_id] = {
+                'method': request.method,
+                'url': str(request.url),
+                'start_time': start_time,
+                'user_id': getattr(request.state, 'user_id', None)
+            }
         
         # Extract endpoint pattern for metrics
         endpoint_pattern = self._extract_endpoint_pattern(request)
@@ -153,26 +184,15 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         finally:
             # Cleanup
             ACTIVE_REQUESTS.dec()
-            if request_id in self.active_requests:
-                del self.active_requests[request_id]
+            if self.track_active_requests:
+                self.active_requests.pop(request_id, None)
     
     def _extract_endpoint_pattern(self, request: Request) -> str:
         """Extract endpoint pattern for consistent metrics labeling."""
         path = request.url.path
         
-        # Common patterns for path normalization
-        patterns = [
-            (r'/api/v1/transactions/[^/]+', '/api/v1/transactions/{id}'),
-            (r'/api/v1/accounts/[^/]+', '/api/v1/accounts/{id}'),
-            (r'/api/v1/categories/[^/]+', '/api/v1/categories/{id}'),
-            (r'/api/v1/budgets/[^/]+', '/api/v1/budgets/{id}'),
-            (r'/api/v1/backup/exports/[^/]+', '/api/v1/backup/exports/{id}'),
-            (r'/api/v1/asana/tasks/[^/]+', '/api/v1/asana/tasks/{id}'),
-        ]
-        
-        import re
-        for pattern, replacement in patterns:
-            if re.search(pattern, path):
+        for pattern, replacement in _ENDPOINT_PATTERNS:
+            if pattern.search(path):
                 return replacement
         
         return path
@@ -210,17 +230,27 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
     
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP considering proxy headers."""
+        # Scan the raw ASGI headers (lowercased bytes) once instead of building
+        # a Headers wrapper and doing a lookup per proxy header
+        forwarded_for = real_ip = None
+        for name, value in request.scope.get('headers', ()):
+            if name == b'x-forwarded-for':
+                if forwarded_for is None:
+                    forwarded_for = value
+            elif name == b'x-real-ip':
+                if real_ip is None:
+                    real_ip = value
+        
         # Check for proxy headers first
-        forwarded_for = request.headers.get('x-forwarded-for')
         if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
+            return forwarded_for.split(b',', 1)[0].strip().decode('latin-1')
         
-        real_ip = request.headers.get('x-real-ip')
         if real_ip:
-            return real_ip
+            return real_ip.decode('latin-1')
         
         # Fallback to direct connection
-        return request.client.host if request.client else 'unknown'
+        client = request.scope.get('client')
+        return client[0] if client else 'unknown'
     
     async def _track_business_metrics(self, request: Request, response: Response, duration: float):
         """Track business metrics for analytics."""
@@ -260,42 +290,44 @@ class MetricsCollector:
     
     def __init__(self):
         self.settings = get_settings()
+        # Labelled children per metric, keyed by label values; the label sets are
+        # small and fixed, so this skips labels() resolution on every record
+        self._database_children: Dict[tuple, Any] = {}
+        self._external_api_children: Dict[tuple, Any] = {}
+        self._cache_children: Dict[tuple, Any] = {}
+        self._backup_children: Dict[tuple, Any] = {}
+        self._export_children: Dict[tuple, Any] = {}
+    
+    @staticmethod
+    def _child(children: Dict[tuple, Any], metric, *label_values):
+        """Get the labelled child of a metric, resolving it on first use."""
+        child = children.get(label_values)
+        if child is None:
+            child = children[label_values] = metric.labels(*label_values)
+        return child
     
     def record_database_operation(self, operation: str, collection: str, status: str = 'success'):
         """Record database operation metrics."""
-        DATABASE_OPERATIONS.labels(
-            operation=operation,
-            collection=collection,
-            status=status
+        self._child(
+            self._database_children, DATABASE_OPERATIONS, operation, collection, status
         ).inc()
     
     def record_external_api_call(self, service: str, status: str = 'success'):
         """Record external API call metrics."""
-        EXTERNAL_API_CALLS.labels(
-            service=service,
-            status=status
-        ).inc()
+        self._child(self._external_api_children, EXTERNAL_API_CALLS, service, status).inc()
     
     def record_cache_operation(self, operation: str, status: str = 'hit'):
         """Record cache operation metrics."""
-        CACHE_OPERATIONS.labels(
-            operation=operation,
-            status=status
-        ).inc()
+        self._child(self._cache_children, CACHE_OPERATIONS, operation, status).inc()
     
     def record_backup_operation(self, backup_type: str, status: str = 'success'):
         """Record backup operation metrics."""
-        BACKUP_OPERATIONS.labels(
-            type=backup_type,
-            status=status
-        ).inc()
+        self._child(self._backup_children, BACKUP_OPERATIONS, backup_type, status).inc()
     
     def record_export_operation(self, format_type: str, export_type: str, status: str = 'success'):
         """Record export operation metrics."""
-        EXPORT_OPERATIONS.labels(
-            format=format_type,
-            type=export_type,
-            status=status
+        self._child(
+            self._export_children, EXPORT_OPERATIONS, format_type, export_type, status
         ).inc()
     
     def update_active_sessions(self, count: int):
@@ -306,6 +338,11 @@ class MetricsCollector:
 class HealthChecker:
     """Advanced health checking for dependencies."""
     
+    # Liveness/readiness probes and dashboards poll together; reuse one report per window
+    CACHE_TTL_SECONDS = 5.0
+    # Upper bound on external API probes in flight at once
+    MAX_CONCURRENT_PROBES = 5
+    
     def __init__(self):
         self.settings = get_settings()
         self._last_check = {}
@@ -314,6 +351,10 @@ class HealthChecker:
             'external_apis': 60,
             'storage': 45
         }
+        self._cached_health: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._health_lock = asyncio.Lock()
+        self._probe_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PROBES)
     
     async def check_firestore_health(self) -> Dict[str, Any]:
         """Check Firestore connectivity and performance."""
@@ -321,7 +362,8 @@ class HealthChecker:
             from ..infrastructure import get_firestore
             firestore = get_firestore()
             
-            start_time = time.time()
+            # Monotonic, high-resolution clock; wall time can jump mid-probe
+            start_ns = time.perf_counter_ns()
             
             # Simple read operation to test connectivity
             test_doc = await firestore.get_document(
@@ -330,11 +372,11 @@ class HealthChecker:
                 model_class=None
             )
             
-            duration = time.time() - start_time
+            duration_ns = time.perf_counter_ns() - start_ns
             
             return {
                 'status': 'healthy',
-                'response_time_ms': round(duration * 1000, 2),
+                'response_time_ms': round(duration_ns / 1_000_000, 2),
                 'timestamp': datetime.utcnow().isoformat()
             }
             
@@ -348,39 +390,43 @@ class HealthChecker:
     
     async def check_external_apis_health(self) -> Dict[str, Any]:
         """Check external API dependencies."""
-        results = {}
+        checks = {}
         
         # Check Google Drive API (if configured)
         if hasattr(self.settings, 'google_client_id') and self.settings.google_client_id:
-            results['google_drive'] = await self._check_google_api()
+            checks['google_drive'] = self._run_probe(self._check_google_api)
         
         # Check Asana API (basic connectivity)
-        results['asana'] = await self._check_asana_api()
+        checks['asana'] = self._run_probe(self._check_asana_api)
         
-        return results
+        # Probes are independent and catch their own errors, so run them concurrently
+        results = await asyncio.gather(*checks.values())
+        return dict(zip(checks, results))
+    
+    async def _run_probe(self, probe) -> Dict[str, Any]:
+        """Run an external API probe, keeping at most MAX_CONCURRENT_PROBES in flight."""
+        async with self._probe_semaphore:
+            return await probe()
     
     async def _check_google_api(self) -> Dict[str, Any]:
         """Check Google API connectivity."""
         try:
-            import httpx
-            
             # Simple check to Google's discovery document
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
-                )
+            response = await _get_http_client().get(
+                "https://www.googleapis.com/discovery/v1/apis/drive/v3/rest"
+            )
+            
+            if response.status_code == 200:
+                return {
+                    'status': 'healthy',
+                    'response_time_ms': response.elapsed.total_seconds() * 1000
+                }
+            else:
+                return {
+                    'status': 'degraded',
+                    'status_code': response.status_code
+                }
                 
-                if response.status_code == 200:
-                    return {
-                        'status': 'healthy',
-                        'response_time_ms': response.elapsed.total_seconds() * 1000
-                    }
-                else:
-                    return {
-                        'status': 'degraded',
-                        'status_code': response.status_code
-                    }
-                    
         except Exception as e:
             return {
                 'status': 'unhealthy',
@@ -390,33 +436,53 @@ class HealthChecker:
     async def _check_asana_api(self) -> Dict[str, Any]:
         """Check Asana API connectivity."""
         try:
-            import httpx
-            
             # Check Asana API status endpoint
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get("https://app.asana.com/api/1.0/users/me")
+            response = await _get_http_client().get("https://app.asana.com/api/1.0/users/me")
+            
+            # We expect 401 (unauthorized) as we're not sending auth
+            # This confirms the API is reachable
+            if response.status_code == 401:
+                return {
+                    'status': 'healthy',
+                    'response_time_ms': response.elapsed.total_seconds() * 1000
+                }
+            else:
+                return {
+                    'status': 'degraded',
+                    'status_code': response.status_code
+                }
                 
-                # We expect 401 (unauthorized) as we're not sending auth
-                # This confirms the API is reachable
-                if response.status_code == 401:
-                    return {
-                        'status': 'healthy',
-                        'response_time_ms': response.elapsed.total_seconds() * 1000
-                    }
-                else:
-                    return {
-                        'status': 'degraded',
-                        'status_code': response.status_code
-                    }
-                    
         except Exception as e:
             return {
                 'status': 'unhealthy',
                 'error': str(e)
             }
     
+    def _fresh_cached_health(self) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached report if it is still within the TTL."""
+        if self._cached_health is not None and time.monotonic() - self._cached_at < self.CACHE_TTL_SECONDS:
+            return copy.deepcopy(self._cached_health)
+        return None
+    
     async def get_comprehensive_health(self) -> Dict[str, Any]:
-        """Get comprehensive health status."""
+        """Get comprehensive health status, probing dependencies at most once per TTL window."""
+        cached = self._fresh_cached_health()
+        if cached is not None:
+            return cached
+        
+        # Concurrent callers wait for the probe in flight instead of starting their own
+        async with self._health_lock:
+            cached = self._fresh_cached_health()
+            if cached is not None:
+                return cached
+            
+            health_data = await self._run_health_checks()
+            self._cached_health = health_data
+            self._cached_at = time.monotonic()
+            return copy.deepcopy(health_data)
+    
+    async def _run_health_checks(self) -> Dict[str, Any]:
+        """Probe all dependencies and build the health report."""
         health_data = {
             'timestamp': datetime.utcnow().isoformat(),
             'overall_status': 'healthy'
@@ -458,6 +524,36 @@ class HealthChecker:
 metrics_collector = MetricsCollector()
 health_checker = HealthChecker()
 
+# Pooled client for health probes, so repeated checks reuse keep-alive
+# connections (and TLS sessions) instead of handshaking every time
+_http_client = None
+
+
+def _get_http_client():
+    """Get the shared HTTP client for health probes, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+        _http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60.0
+            ),
+            http2=HTTP2_AVAILABLE
+        )
+    return _http_client
+
+
+async def cleanup_health_http_client():
+    """Close the shared health probe HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("Health check HTTP client closed")
+
 
 def get_metrics_collector() -> MetricsCollector:
     """Get the global metrics collector instance."""
@@ -469,6 +565,38 @@ def get_health_checker() -> HealthChecker:
     return health_checker
 
 
-async def get_prometheus_metrics() -> str:
-    """Generate Prometheus metrics."""
-    return generate_latest().decode('utf-8')
\ No newline at end of file
+# Scrapes arriving within this window reuse the last exposition text
+METRICS_CACHE_TTL_SECONDS = 0.5
+_metrics_cache = (float('-inf'), '')
+_multiprocess_registry: Optional[CollectorRegistry] = None
+
+
+def _get_multiprocess_registry() -> Optional[CollectorRegistry]:
+    """Registry aggregating every worker's metrics, when running multiprocess.
+    
+    With several workers each process only sees its own samples, so a scrape
+    must read the shared PROMETHEUS_MULTIPROC_DIR files instead.
+    """
+    global _multiprocess_registry
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        return None
+    if _multiprocess_registry is None:
+        _multiprocess_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(_multiprocess_registry)
+    return _multiprocess_registry
+
+
+async def get_prometheus_metrics(max_age: float = METRICS_CACHE_TTL_SECONDS) -> str:
+    """Generate Prometheus metrics, reusing output no older than max_age seconds."""
+    global _metrics_cache
+    now = time.monotonic()
+    generated_at, output = _metrics_cache
+    if now - generated_at < max_age:
+        return output
+    
+    # No await between the check and the store, so concurrent scrapes on the
+    # event loop can't both regenerate
+    registry = _get_multiprocess_registry()
+    output = (generate_latest(registry) if registry is not None else generate_latest()).decode('utf-8')
+    _metrics_cache = (now, output)
+    return output
@@ -258,6 +258,20 @@ class TransactionSummary(BaseModel):
     destination_account_id: Optional[str] = None
     is_active: bool = True
 
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> "TransactionSummary":
+        """Build a summary from an already validated transaction without re-validating it."""
+        return cls.model_construct(
+            id=transaction.id,
+            amount=transaction.amount,
+            description=transaction.description,
+            transaction_type=transaction.transaction_type,
+            transaction_date=transaction.transaction_date,
+            is_confirmed=transaction.is_confirmed,
+            destination_account_id=transaction.destination_account_id,
+            is_active=transaction.is_active
+        )
+
 
 class CategorySummary(BaseModel):
     """Category summary for listings."""
@@ -366,7 +380,29 @@ class TransactionResponse(BaseModel):
     is_reconciled: bool
     created_at: datetime
     updated_at: datetime
-    
+
+    @classmethod
+    def from_transaction(cls, transaction: Transaction) -> "TransactionResponse":
+        """Build a response from an already validated transaction without re-validating it."""
+        return cls.model_construct(
+            id=transaction.id,
+            amount=transaction.amount,
+            description=transaction.description,
+            transaction_type=transaction.transaction_type,
+            transaction_date=transaction.transaction_date,
+            account_id=transaction.account_id,
+            to_account_id=transaction.destination_account_id,
+            category_id=transaction.category_id,
+            subcategory_id=transaction.subcategory_id,
+            reference=transaction.reference,
+            notes=transaction.notes,
+            tags=transaction.tags,
+            is_confirmed=transaction.is_confirmed,
+            is_reconciled=transaction.is_reconciled,
+            created_at=transaction.created_at,
+            updated_at=transaction.updated_at
+        )
+
 
 class AccountResponse(BaseModel):
     """Complete account response."""
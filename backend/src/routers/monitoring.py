@@ -5,7 +5,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, Request
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 import structlog
 
 from ..models.auth import User, UserRole
@@ -24,9 +24,11 @@ from ..utils.exceptions import ValidationError as AppValidationError
 
 logger = structlog.get_logger()
 
+# Health and status endpoints are polled constantly; orjson serializes their dicts faster
 router = APIRouter(
     prefix="/monitoring",
-    tags=["monitoring", "admin"]
+    tags=["monitoring", "admin"],
+    default_response_class=ORJSONResponse
 )
 
 
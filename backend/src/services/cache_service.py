@@ -24,7 +24,8 @@ try:
     import aioredis
     from aioredis import Redis
     REDIS_AVAILABLE = True
-except ImportError:
+# aioredis 2.0.1 raises TypeError (duplicate base class TimeoutError) on Python 3.11+
+except (ImportError, TypeError):
     REDIS_AVAILABLE = False
     logger.warning("Redis not available, using in-memory cache fallback")
 
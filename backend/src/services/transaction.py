@@ -104,21 +104,7 @@ class TransactionService:
             )
             
             # Return response
-            return TransactionResponse(
-                id=transaction.id,
-                account_id=transaction.account_id,
-                category_id=transaction.category_id,
-                amount=transaction.amount,
-                description=transaction.description,
-                transaction_date=transaction.transaction_date,
-                destination_account_id=transaction.destination_account_id,
-                reference_number=transaction.reference_number,
-                notes=transaction.notes,
-                tags=transaction.tags,
-                is_active=transaction.is_active,
-                created_at=transaction.created_at,
-                updated_at=transaction.updated_at
-            )
+            return TransactionResponse.from_transaction(transaction)
             
         except Exception as e:
             logger.error("Failed to create transaction", user_id=user_id, error=str(e))
@@ -143,21 +129,7 @@ class TransactionService:
                     resource_id=transaction_id
                 )
             
-            return TransactionResponse(
-                id=transaction.id,
-                account_id=transaction.account_id,
-                category_id=transaction.category_id,
-                amount=transaction.amount,
-                description=transaction.description,
-                transaction_date=transaction.transaction_date,
-                destination_account_id=transaction.destination_account_id,
-                reference_number=transaction.reference_number,
-                notes=transaction.notes,
-                tags=transaction.tags,
-                is_active=transaction.is_active,
-                created_at=transaction.created_at,
-                updated_at=transaction.updated_at
-            )
+            return TransactionResponse.from_transaction(transaction)
             
         except NotFoundError:
             raise
@@ -204,16 +176,7 @@ class TransactionService:
             )
             
             return [
-                TransactionSummary(
-                    id=transaction.id,
-                    account_id=transaction.account_id,
-                    category_id=transaction.category_id,
-                    amount=transaction.amount,
-                    description=transaction.description,
-                    transaction_date=transaction.transaction_date,
-                    destination_account_id=transaction.destination_account_id,
-                    is_active=transaction.is_active
-                )
+                TransactionSummary.from_transaction(transaction)
                 for transaction in transactions
             ]
             
@@ -329,21 +292,7 @@ class TransactionService:
                 fields_updated=list(update_data.keys())
             )
             
-            return TransactionResponse(
-                id=transaction.id,
-                account_id=transaction.account_id,
-                category_id=transaction.category_id,
-                amount=transaction.amount,
-                description=transaction.description,
-                transaction_date=transaction.transaction_date,
-                destination_account_id=transaction.destination_account_id,
-                reference_number=transaction.reference_number,
-                notes=transaction.notes,
-                tags=transaction.tags,
-                is_active=transaction.is_active,
-                created_at=transaction.created_at,
-                updated_at=transaction.updated_at
-            )
+            return TransactionResponse.from_transaction(transaction)
             
         except NotFoundError:
             raise
@@ -357,39 +306,31 @@ class TransactionService:
     async def delete_transaction(self, user_id: str, transaction_id: str) -> None:
         """Soft delete transaction."""
         try:
-            # Get existing transaction
-            transaction = await self.firestore.get_document(
+            # Soft delete in a single field update; a missing document raises NotFoundError
+            now = datetime.utcnow()
+            await self.firestore.patch_document(
                 collection=f"transactions/{user_id}/user_transactions",
                 document_id=transaction_id,
-                model_class=Transaction
-            )
-            
-            if not transaction:
-                raise NotFoundError(
-                    message="Transaction not found",
-                    resource_type="transaction",
-                    resource_id=transaction_id
-                )
-            
-            # Soft delete
-            transaction.soft_delete()
-            
-            # Save to Firestore
-            await self.firestore.update_document(
-                collection=f"transactions/{user_id}/user_transactions",
-                document_id=transaction_id,
-                data=transaction
+                updates={
+                    "is_active": False,
+                    "is_deleted": True,
+                    "deleted_at": now,
+                    "updated_at": now
+                }
             )
             
             logger.info(
                 "Transaction deleted successfully",
                 user_id=user_id,
-                transaction_id=transaction_id,
-                amount=str(transaction.amount)
+                transaction_id=transaction_id
             )
             
         except NotFoundError:
-            raise
+            raise NotFoundError(
+                message="Transaction not found",
+                resource_type="transaction",
+                resource_id=transaction_id
+            )
         except Exception as e:
             logger.error("Failed to delete transaction", user_id=user_id, transaction_id=transaction_id, error=str(e))
             raise AppValidationError(
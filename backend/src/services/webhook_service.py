@@ -5,22 +5,41 @@ with retry logic, security, and comprehensive logging.
 """
 
 import asyncio
-import json
 import hmac
 import hashlib
-import uuid
+import heapq
+import itertools
+import secrets
+import time
+import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple, Union
 from enum import Enum
 from dataclasses import dataclass, field
 import httpx
+import orjson
 import structlog
-from urllib.parse import urlparse
+from urllib.parse import urlencode, urlparse
 
 from src.config import settings
+from src.middleware.rate_limiting import TokenBucket
+from src.utils.http import HTTP2_AVAILABLE
 
 logger = structlog.get_logger()
 
+# Form/XML payloads larger than this (measured as JSON) are serialized in a
+# worker thread so big bodies don't stall other deliveries on the event loop
+OFFLOAD_SERIALIZATION_BYTES = 64 * 1024
+
+# Only the start of a receiver's response is kept for diagnostics, so stop
+# reading once this much has arrived instead of buffering the whole body
+MAX_RESPONSE_BODY_BYTES = 1024
+
+# Outbound limits per receiving host, so fan-out to many endpoints on one
+# domain doesn't burst past the receiver's own rate limits
+MAX_CONCURRENT_DELIVERIES_PER_HOST = 8
+MAX_DELIVERIES_PER_SECOND_PER_HOST = 20
+
 
 class WebhookEvent(Enum):
     """Types of webhook events."""
@@ -59,7 +78,7 @@ class WebhookFormat(Enum):
     XML = "xml"
 
 
-@dataclass
+@dataclass(slots=True)
 class WebhookEndpoint:
     """Webhook endpoint configuration."""
     id: str
@@ -81,9 +100,17 @@ class WebhookEndpoint:
     total_deliveries: int = 0
     successful_deliveries: int = 0
     failed_deliveries: int = 0
+    # filter_conditions pre-split into (key path, expected value) pairs
+    _compiled_filter: Optional[List[Tuple[Tuple[str, ...], Any]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # HMAC keyed with the endpoint secret, copied per delivery to skip key setup
+    _hmac_template: Optional["hmac.HMAC"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
 
-@dataclass
+@dataclass(slots=True)
 class WebhookDelivery:
     """Webhook delivery record."""
     id: str
@@ -102,9 +129,9 @@ class WebhookDelivery:
     duration_ms: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WebhookPayload:
-    """Webhook payload structure."""
+    """Webhook payload structure (schema of the body built in deliver_webhook)."""
     event: str
     timestamp: str
     data: Dict[str, Any]
@@ -114,21 +141,45 @@ class WebhookPayload:
     version: str = "1.0"
 
 
+# Algorithms accepted in incoming signatures; anything else is rejected
+# before any hashing, since the algorithm name comes from the caller
+SIGNATURE_ALGORITHMS: Dict[str, Callable] = {
+    "sha256": hashlib.sha256,
+    "sha1": hashlib.sha1,
+}
+
+
 class WebhookSigner:
     """Handles webhook signature generation and verification."""
     
     @staticmethod
-    def generate_signature(payload: str, secret: str, algorithm: str = "sha256") -> str:
+    def generate_signature(payload: Union[str, bytes], secret: str, algorithm: str = "sha256") -> str:
         """Generate HMAC signature for webhook payload."""
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
         signature = hmac.new(
             secret.encode('utf-8'),
-            payload.encode('utf-8'),
+            payload,
             getattr(hashlib, algorithm)
         ).hexdigest()
         return f"{algorithm}={signature}"
     
     @staticmethod
-    def verify_signature(payload: str, signature: str, secret: str) -> bool:
+    def prime(endpoint: WebhookEndpoint) -> None:
+        """Precompute the endpoint's keyed HMAC state."""
+        endpoint._hmac_template = hmac.new(endpoint.secret.encode('utf-8'), digestmod=hashlib.sha256)
+    
+    @staticmethod
+    def sign_for_endpoint(payload: bytes, endpoint: WebhookEndpoint) -> str:
+        """Generate a sha256 signature from the endpoint's primed HMAC."""
+        if endpoint._hmac_template is None:
+            WebhookSigner.prime(endpoint)
+        mac = endpoint._hmac_template.copy()
+        mac.update(payload)
+        return f"sha256={mac.hexdigest()}"
+    
+    @staticmethod
+    def verify_signature(payload: Union[str, bytes], signature: str, secret: str) -> bool:
         """Verify webhook signature."""
         try:
             # Extract algorithm and signature
@@ -136,10 +187,16 @@ class WebhookSigner:
                 return False
             
             algorithm, provided_sig = signature.split('=', 1)
-            expected_sig = WebhookSigner.generate_signature(payload, secret, algorithm)
+            digestmod = SIGNATURE_ALGORITHMS.get(algorithm)
+            if digestmod is None:
+                return False
+            
+            if isinstance(payload, str):
+                payload = payload.encode('utf-8')
+            expected_sig = hmac.new(secret.encode('utf-8'), payload, digestmod).hexdigest().encode('ascii')
             
             # Use constant-time comparison
-            return hmac.compare_digest(expected_sig, signature)
+            return hmac.compare_digest(expected_sig, provided_sig.encode('utf-8'))
             
         except Exception as e:
             logger.error("Signature verification failed", error=str(e))
@@ -152,17 +209,32 @@ class WebhookFilter:
     def __init__(self):
         pass
     
+    @staticmethod
+    def compile(endpoint: WebhookEndpoint) -> None:
+        """Pre-split the endpoint's filter paths so matching skips per-event parsing."""
+        endpoint._compiled_filter = [
+            (tuple(field_path.split('.')), expected_value)
+            for field_path, expected_value in endpoint.filter_conditions.items()
+        ]
+    
     def should_deliver(self, endpoint: WebhookEndpoint, event_data: Dict[str, Any]) -> bool:
         """Check if webhook should be delivered based on filter conditions."""
         if not endpoint.filter_conditions:
             return True
         
+        if endpoint._compiled_filter is None:
+            self.compile(endpoint)
+        
         try:
             # Apply filters
-            for field_path, expected_value in endpoint.filter_conditions.items():
-                actual_value = self._get_nested_value(event_data, field_path)
+            for keys, expected_value in endpoint._compiled_filter:
+                value = event_data
+                for key in keys:
+                    value = value.get(key) if isinstance(value, dict) else None
+                    if value is None:
+                        break
                 
-                if actual_value != expected_value:
+                if value != expected_value:
                     return False
             
             return True
@@ -172,73 +244,184 @@ class WebhookFilter:
                         endpoint_id=endpoint.id, 
                         error=str(e))
             return True  # Default to delivery on filter errors
+
+
+def _to_json(data: Dict[str, Any]) -> bytes:
+    """Convert data to JSON bytes, rendering unsupported types with str()."""
+    return orjson.dumps(
+        data,
+        default=str,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+
+# Closing fields of a JSON payload; together with _json_payload_prefix this
+# yields exactly the bytes _to_json would produce for the full WebhookPayload
+_JSON_PAYLOAD_TAIL = b',"signature":null,"version":"1.0"}'
+
+
+def _json_payload_prefix(event: str, timestamp: str, data: Dict[str, Any], user_id: str) -> bytes:
+    """Serialize the endpoint-independent JSON payload fields, leaving the object open."""
+    return _to_json({
+        "event": event,
+        "timestamp": timestamp,
+        "data": data,
+        "user_id": user_id
+    })[:-1]
+
+
+def _json_payload(prefix: bytes, webhook_id: str) -> bytes:
+    """Complete a shared JSON payload prefix for one endpoint."""
+    return b"".join((prefix, b',"webhook_id":', orjson.dumps(webhook_id), _JSON_PAYLOAD_TAIL))
+
+
+def _to_form_data(data: Dict[str, Any]) -> bytes:
+    """Convert data to form-encoded bytes."""
+    return urlencode(_flatten_dict(data)).encode('utf-8')
+
+
+def _to_xml(data: Dict[str, Any]) -> bytes:
+    """Convert data to XML bytes."""
+    root = ET.Element("webhook")
+    stack = [(root, data)]
     
-    def _get_nested_value(self, data: Dict[str, Any], path: str) -> Any:
-        """Get nested value from data using dot notation."""
-        keys = path.split('.')
-        value = data
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return None
-        
-        return value
+    # Children are created in order as each dict is visited, so an explicit
+    # stack preserves document order without recursion
+    while stack:
+        parent, d = stack.pop()
+        for key, value in d.items():
+            items = value if isinstance(value, list) else (value,)
+            for item in items:
+                element = ET.SubElement(parent, key)
+                if isinstance(item, dict):
+                    stack.append((element, item))
+                else:
+                    element.text = str(item)
+    
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+
+def _flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
+    """Flatten nested dictionary."""
+    items = {}
+    stack = [(parent_key, d)]
+    
+    # LIFO with children pushed in reverse keeps the depth-first key order
+    # of the recursive version without intermediate dicts per level
+    while stack:
+        prefix, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(
+                (f"{prefix}{sep}{k}" if prefix else k, v)
+                for k, v in reversed(value.items())
+            )
+        else:
+            items[prefix] = str(value)
+    
+    return items
+
+
+_JSON_CONTENT_TYPE = "application/json"
+
+# Cold-path serializers for the non-default formats: (serializer, content type)
+_SERIALIZERS: Dict[WebhookFormat, Tuple[Callable[[Dict[str, Any]], bytes], str]] = {
+    WebhookFormat.FORM_DATA: (_to_form_data, "application/x-www-form-urlencoded"),
+    WebhookFormat.XML: (_to_xml, "application/xml"),
+}
 
 
 class WebhookDeliveryEngine:
     """Handles webhook delivery with retry logic."""
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client for all deliveries so keep-alive connections
+        # (and TLS sessions) to webhook hosts are reused across events
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=200,
+                max_keepalive_connections=100,
+                keepalive_expiry=60.0
+            ),
+            http2=HTTP2_AVAILABLE
+        )
         self.signer = WebhookSigner()
         self.filter = WebhookFilter()
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_buckets: Dict[str, TokenBucket] = {}
+    
+    def _get_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Get or create the concurrency limit for a receiving host."""
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(MAX_CONCURRENT_DELIVERIES_PER_HOST)
+        return self._host_semaphores[host]
+    
+    async def _throttle(self, host: str):
+        """Wait until the host's token bucket allows another delivery."""
+        bucket = self._host_buckets.get(host)
+        if bucket is None:
+            bucket = self._host_buckets[host] = TokenBucket(
+                max_tokens=MAX_DELIVERIES_PER_SECOND_PER_HOST,
+                refill_rate=MAX_DELIVERIES_PER_SECOND_PER_HOST
+            )
+        while not await bucket.consume():
+            await asyncio.sleep(1 / MAX_DELIVERIES_PER_SECOND_PER_HOST)
     
     async def deliver_webhook(self, endpoint: WebhookEndpoint, 
-                            delivery: WebhookDelivery) -> bool:
-        """Deliver webhook to endpoint."""
+                            delivery: WebhookDelivery,
+                            json_prefix: Optional[bytes] = None,
+                            filtered: bool = False) -> bool:
+        """Deliver webhook to endpoint.
+        
+        json_prefix is an already serialized _json_payload_prefix for this
+        delivery's event, shared by every endpoint the event fans out to: JSON
+        endpoints complete it, other formats use its length as a size estimate.
+        filtered is set by callers that already applied the endpoint's filter.
+        """
         if not endpoint.is_active:
             logger.info("Webhook endpoint is disabled", endpoint_id=endpoint.id)
             delivery.status = WebhookStatus.DISABLED
             return False
         
         # Check filters
-        if not self.filter.should_deliver(endpoint, delivery.payload):
+        if not filtered and not self.filter.should_deliver(endpoint, delivery.payload):
             logger.info("Webhook filtered out", endpoint_id=endpoint.id)
             return True  # Not an error, just filtered
         
-        # Prepare payload
-        webhook_payload = WebhookPayload(
-            event=delivery.event_type.value,
-            timestamp=delivery.created_at.isoformat() + "Z",
-            data=delivery.payload,
-            user_id=endpoint.user_id,
-            webhook_id=endpoint.id,
-            version="1.0"
-        )
-        
-        # Convert to appropriate format
-        if endpoint.format == WebhookFormat.JSON:
-            payload_str = json.dumps(webhook_payload.__dict__, default=str)
-            content_type = "application/json"
-        elif endpoint.format == WebhookFormat.FORM_DATA:
-            payload_str = self._to_form_data(webhook_payload.__dict__)
-            content_type = "application/x-www-form-urlencoded"
-        else:  # XML
-            payload_str = self._to_xml(webhook_payload.__dict__)
-            content_type = "application/xml"
+        event_value = delivery.event_type.value
+        timestamp = delivery.created_at.isoformat() + "Z"
+        
+        if json_prefix is None:
+            json_prefix = _json_payload_prefix(event_value, timestamp, delivery.payload, endpoint.user_id)
+        
+        # Convert to appropriate format (JSON is the default and common case)
+        if endpoint.format is WebhookFormat.JSON:
+            payload_bytes = _json_payload(json_prefix, endpoint.id)
+            content_type = _JSON_CONTENT_TYPE
+        else:
+            # Payload as a plain dict laid out like WebhookPayload
+            webhook_payload = {
+                "event": event_value,
+                "timestamp": timestamp,
+                "data": delivery.payload,
+                "user_id": endpoint.user_id,
+                "webhook_id": endpoint.id,
+                "signature": None,
+                "version": "1.0"
+            }
+            serializer, content_type = _SERIALIZERS[endpoint.format]
+            payload_bytes = await self._serialize(serializer, webhook_payload, len(json_prefix))
         
         # Generate signature
-        signature = self.signer.generate_signature(payload_str, endpoint.secret)
+        signature = self.signer.sign_for_endpoint(payload_bytes, endpoint)
         
         # Prepare headers
         headers = {
             "Content-Type": content_type,
             "X-Webhook-Signature": signature,
-            "X-Webhook-Event": delivery.event_type.value,
+            "X-Webhook-Event": event_value,
             "X-Webhook-ID": delivery.id,
-            "X-Webhook-Timestamp": webhook_payload.timestamp,
+            "X-Webhook-Timestamp": timestamp,
             "User-Agent": f"FinancialNomad-Webhooks/1.0"
         }
         
@@ -246,35 +429,48 @@ class WebhookDeliveryEngine:
         headers.update(endpoint.custom_headers)
         
         # Attempt delivery
-        start_time = datetime.utcnow()
+        host = urlparse(endpoint.url).netloc
         delivery.attempts += 1
         
         try:
-            response = await self.client.post(
-                endpoint.url,
-                content=payload_str,
-                headers=headers,
-                timeout=endpoint.timeout_seconds
-            )
+            async with self._get_host_semaphore(host):
+                await self._throttle(host)
+                start_ns = time.perf_counter_ns()
+                
+                async with self.client.stream(
+                    "POST",
+                    endpoint.url,
+                    content=payload_bytes,
+                    headers=headers,
+                    timeout=endpoint.timeout_seconds
+                ) as response:
+                    body = b""
+                    async for chunk in response.aiter_bytes():
+                        body += chunk
+                        if len(body) >= MAX_RESPONSE_BODY_BYTES:
+                            break
             
-            duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
+            response_text = body[:MAX_RESPONSE_BODY_BYTES].decode(response.encoding or "utf-8", errors="replace")
             delivery.duration_ms = duration_ms
             delivery.response_status = response.status_code
-            delivery.response_body = response.text[:1000]  # Limit response body
+            delivery.response_body = response_text[:1000]  # Limit response body
             
             # Check if delivery was successful
             if 200 <= response.status_code < 300:
+                delivered_at = datetime.utcnow()
                 delivery.status = WebhookStatus.DELIVERED
-                delivery.delivered_at = datetime.utcnow()
+                delivery.delivered_at = delivered_at
                 
                 # Update endpoint stats
                 endpoint.successful_deliveries += 1
                 endpoint.total_deliveries += 1
-                endpoint.last_used = datetime.utcnow()
+                endpoint.last_used = delivered_at
                 
                 logger.info("Webhook delivered successfully",
                            endpoint_id=endpoint.id,
                            delivery_id=delivery.id,
+                           event_type=event_value,
                            status_code=response.status_code,
                            duration_ms=duration_ms)
                 
@@ -282,7 +478,7 @@ class WebhookDeliveryEngine:
             else:
                 # HTTP error response
                 delivery.status = WebhookStatus.FAILED
-                delivery.error_message = f"HTTP {response.status_code}: {response.text[:200]}"
+                delivery.error_message = f"HTTP {response.status_code}: {response_text[:200]}"
                 
                 endpoint.failed_deliveries += 1
                 endpoint.total_deliveries += 1
@@ -323,42 +519,15 @@ class WebhookDeliveryEngine:
             
             return False
     
-    def _to_form_data(self, data: Dict[str, Any]) -> str:
-        """Convert data to form-encoded string."""
-        from urllib.parse import urlencode
-        flattened = self._flatten_dict(data)
-        return urlencode(flattened)
-    
-    def _to_xml(self, data: Dict[str, Any]) -> str:
-        """Convert data to XML string."""
-        def dict_to_xml(d, root_name="webhook"):
-            xml = f"<{root_name}>"
-            for key, value in d.items():
-                if isinstance(value, dict):
-                    xml += dict_to_xml(value, key)
-                elif isinstance(value, list):
-                    for item in value:
-                        if isinstance(item, dict):
-                            xml += dict_to_xml(item, key)
-                        else:
-                            xml += f"<{key}>{item}</{key}>"
-                else:
-                    xml += f"<{key}>{value}</{key}>"
-            xml += f"</{root_name}>"
-            return xml
-        
-        return f'<?xml version="1.0" encoding="UTF-8"?>\n{dict_to_xml(data)}'
-    
-    def _flatten_dict(self, d: Dict[str, Any], parent_key: str = '', sep: str = '.') -> Dict[str, Any]:
-        """Flatten nested dictionary."""
-        items = []
-        for k, v in d.items():
-            new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            if isinstance(v, dict):
-                items.extend(self._flatten_dict(v, new_key, sep=sep).items())
-            else:
-                items.append((new_key, str(v)))
-        return dict(items)
+    async def _serialize(self, serializer: Callable[[Dict[str, Any]], bytes],
+                         data: Dict[str, Any], size_hint: int) -> bytes:
+        """Run a pure-Python serializer, off the event loop for large payloads.
+        
+        size_hint is the payload's approximate encoded size in bytes.
+        """
+        if size_hint > OFFLOAD_SERIALIZATION_BYTES:
+            return await asyncio.to_thread(serializer, data)
+        return serializer(data)
     
     async def close(self):
         """Close HTTP client."""
@@ -369,7 +538,13 @@ class WebhookRetryManager:
     """Manages webhook retry logic."""
     
     def __init__(self):
-        self.retry_queue: List[WebhookDelivery] = []
+        # Min-heap ordered by next_retry; the sequence number breaks ties so
+        # deliveries themselves are never compared
+        self._retry_heap: List[Tuple[datetime, int, WebhookDelivery]] = []
+        self._sequence = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._retry_heap)
     
     def schedule_retry(self, delivery: WebhookDelivery, endpoint: WebhookEndpoint):
         """Schedule webhook for retry."""
@@ -386,7 +561,7 @@ class WebhookRetryManager:
         delivery.next_retry = datetime.utcnow() + timedelta(seconds=retry_delay)
         delivery.status = WebhookStatus.RETRY
         
-        self.retry_queue.append(delivery)
+        heapq.heappush(self._retry_heap, (delivery.next_retry, next(self._sequence), delivery))
         
         logger.info("Webhook scheduled for retry",
                    delivery_id=delivery.id,
@@ -398,16 +573,17 @@ class WebhookRetryManager:
         """Get deliveries ready for retry."""
         now = datetime.utcnow()
         ready = []
-        remaining = []
         
-        for delivery in self.retry_queue:
-            if delivery.next_retry and delivery.next_retry <= now:
-                ready.append(delivery)
-            else:
-                remaining.append(delivery)
+        while self._retry_heap and self._retry_heap[0][0] <= now:
+            ready.append(heapq.heappop(self._retry_heap)[2])
         
-        self.retry_queue = remaining
         return ready
+    
+    def seconds_until_next_retry(self) -> Optional[float]:
+        """Get seconds until the earliest scheduled retry is due, if any."""
+        if not self._retry_heap:
+            return None
+        return max((self._retry_heap[0][0] - datetime.utcnow()).total_seconds(), 0.0)
 
 
 class WebhookRegistry:
@@ -417,10 +593,33 @@ class WebhookRegistry:
         self.endpoints: Dict[str, WebhookEndpoint] = {}
         self.event_handlers: Dict[WebhookEvent, List[Callable]] = {}
         self.deliveries: Dict[str, WebhookDelivery] = {}
+        # (event, user_id) -> endpoint IDs, so publishing doesn't scan every endpoint
+        self._by_event_user: Dict[Tuple[WebhookEvent, str], Set[str]] = {}
+    
+    def _index_endpoint(self, endpoint: WebhookEndpoint):
+        """Add endpoint to the event/user index."""
+        for event in endpoint.events:
+            self._by_event_user.setdefault((event, endpoint.user_id), set()).add(endpoint.id)
+    
+    def _unindex_endpoint(self, endpoint: WebhookEndpoint):
+        """Remove endpoint from the event/user index."""
+        for event in endpoint.events:
+            key = (event, endpoint.user_id)
+            endpoint_ids = self._by_event_user.get(key)
+            if endpoint_ids is not None:
+                endpoint_ids.discard(endpoint.id)
+                if not endpoint_ids:
+                    del self._by_event_user[key]
     
     def register_endpoint(self, endpoint: WebhookEndpoint):
         """Register webhook endpoint."""
+        existing = self.endpoints.get(endpoint.id)
+        if existing is not None:
+            self._unindex_endpoint(existing)
+        
         self.endpoints[endpoint.id] = endpoint
+        self._index_endpoint(endpoint)
+        WebhookSigner.prime(endpoint)
         logger.info("Webhook endpoint registered",
                    endpoint_id=endpoint.id,
                    url=endpoint.url,
@@ -429,17 +628,23 @@ class WebhookRegistry:
     def unregister_endpoint(self, endpoint_id: str):
         """Unregister webhook endpoint."""
         if endpoint_id in self.endpoints:
-            del self.endpoints[endpoint_id]
+            self._unindex_endpoint(self.endpoints.pop(endpoint_id))
             logger.info("Webhook endpoint unregistered", endpoint_id=endpoint_id)
     
+    def update_endpoint_events(self, endpoint: WebhookEndpoint, events: List[WebhookEvent]):
+        """Change the events an endpoint subscribes to, keeping the index in sync."""
+        self._unindex_endpoint(endpoint)
+        endpoint.events = events
+        self._index_endpoint(endpoint)
+    
     def get_endpoints_for_event(self, event: WebhookEvent, user_id: str) -> List[WebhookEndpoint]:
         """Get endpoints subscribed to specific event for user."""
-        return [
-            endpoint for endpoint in self.endpoints.values()
-            if endpoint.user_id == user_id 
-            and event in endpoint.events 
-            and endpoint.is_active
-        ]
+        endpoints = []
+        for endpoint_id in self._by_event_user.get((event, user_id), ()):
+            endpoint = self.endpoints[endpoint_id]
+            if endpoint.is_active:
+                endpoints.append(endpoint)
+        return endpoints
     
     def get_endpoint(self, endpoint_id: str) -> Optional[WebhookEndpoint]:
         """Get endpoint by ID."""
@@ -464,9 +669,25 @@ class WebhookService:
         self.delivery_engine = WebhookDeliveryEngine()
         self.retry_manager = WebhookRetryManager()
         self.is_processing = False
+        self.retry_task: Optional[asyncio.Task] = None
         
         logger.info("Webhook service initialized")
     
+    def _start_retry_task(self):
+        """Start the background retry loop if it is not already running."""
+        if self.retry_task is None or self.retry_task.done():
+            self.retry_task = asyncio.create_task(self._retry_loop())
+    
+    async def _retry_loop(self):
+        """Dispatch due retries until cancelled."""
+        while True:
+            await self.process_retries()
+            
+            # Wake at most once a second so retries scheduled in between
+            # with an earlier due time are not held back
+            next_delay = self.retry_manager.seconds_until_next_retry()
+            await asyncio.sleep(min(next_delay, 1.0) if next_delay is not None else 1.0)
+    
     async def create_endpoint(self, user_id: str, name: str, url: str, 
                             events: List[WebhookEvent], 
                             custom_headers: Dict[str, str] = None,
@@ -483,7 +704,7 @@ class WebhookService:
         
         # Generate endpoint
         endpoint = WebhookEndpoint(
-            id=f"wh_{uuid.uuid4().hex[:12]}",
+            id=f"wh_{secrets.token_hex(6)}",
             user_id=user_id,
             name=name,
             url=url,
@@ -492,6 +713,7 @@ class WebhookService:
             custom_headers=custom_headers or {},
             filter_conditions=filter_conditions or {}
         )
+        WebhookFilter.compile(endpoint)
         
         self.registry.register_endpoint(endpoint)
         
@@ -514,9 +736,14 @@ class WebhookService:
                          'filter_conditions', 'timeout_seconds', 'max_retries']
         
         for field, value in updates.items():
-            if field in allowed_fields and hasattr(endpoint, field):
+            if field == 'events':
+                self.registry.update_endpoint_events(endpoint, value)
+            elif field in allowed_fields and hasattr(endpoint, field):
                 setattr(endpoint, field, value)
         
+        if 'filter_conditions' in updates:
+            WebhookFilter.compile(endpoint)
+        
         endpoint.updated_at = datetime.utcnow()
         
         logger.info("Webhook endpoint updated",
@@ -540,60 +767,108 @@ class WebhookService:
                           data: Dict[str, Any]) -> List[str]:
         """Publish event to all subscribed webhooks."""
         
-        endpoints = self.registry.get_endpoints_for_event(event, user_id)
-        delivery_ids = []
+        # Inactive endpoints are excluded by the registry; drop filtered-out ones
+        # here so they never get a delivery record
+        endpoints = [
+            endpoint for endpoint in self.registry.get_endpoints_for_event(event, user_id)
+            if self.delivery_engine.filter.should_deliver(endpoint, data)
+        ]
+        pending = []
+        
+        # All deliveries of one event share a timestamp, so every endpoint can
+        # share one serialization of everything except its webhook_id
+        created_at = datetime.utcnow()
+        json_prefix = None
+        if endpoints:
+            try:
+                json_prefix = _json_payload_prefix(event.value, created_at.isoformat() + "Z", data, user_id)
+            except TypeError as e:
+                # Leave serialization to each delivery so the failure is
+                # recorded on its delivery record instead of dropping the event
+                logger.error("Webhook payload serialization failed",
+                            event_type=event.value,
+                            error=str(e))
         
         for endpoint in endpoints:
             # Create delivery record
             delivery = WebhookDelivery(
-                id=f"del_{uuid.uuid4().hex[:12]}",
+                id=f"del_{secrets.token_hex(6)}",
                 endpoint_id=endpoint.id,
                 event_type=event,
                 payload=data,
-                max_attempts=endpoint.max_retries
+                max_attempts=endpoint.max_retries,
+                created_at=created_at
             )
             
             self.registry.deliveries[delivery.id] = delivery
-            delivery_ids.append(delivery.id)
-            
-            # Attempt immediate delivery
-            success = await self.delivery_engine.deliver_webhook(endpoint, delivery)
-            
-            # Schedule retry if failed
-            if not success and delivery.attempts < delivery.max_attempts:
-                self.retry_manager.schedule_retry(delivery, endpoint)
+            pending.append((endpoint, delivery))
+        
+        delivery_ids = [delivery.id for _, delivery in pending]
+        
+        # Deliveries are independent, so attempt them concurrently
+        results = await asyncio.gather(
+            *(
+                self.delivery_engine.deliver_webhook(endpoint, delivery, json_prefix, filtered=True)
+                for endpoint, delivery in pending
+            ),
+            return_exceptions=True
+        )
+        
+        self._handle_results(pending, results)
         
         logger.info("Event published to webhooks",
-                   event=event.value,
+                   event_type=event.value,
                    user_id=user_id,
                    endpoints_count=len(endpoints),
                    deliveries=len(delivery_ids))
         
         return delivery_ids
     
+    def _handle_results(self, pending: List[Tuple[WebhookEndpoint, WebhookDelivery]],
+                        results: List[Union[bool, BaseException]]):
+        """Record gathered delivery outcomes and schedule retries for failures."""
+        for (endpoint, delivery), result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("Webhook delivery raised",
+                            endpoint_id=endpoint.id,
+                            delivery_id=delivery.id,
+                            error=str(result))
+                delivery.status = WebhookStatus.FAILED
+                delivery.error_message = str(result)
+                result = False
+            
+            # Schedule retry if failed
+            if not result and delivery.attempts < delivery.max_attempts:
+                self.retry_manager.schedule_retry(delivery, endpoint)
+                self._start_retry_task()
+    
     async def process_retries(self):
-        """Process webhook retries."""
+        """Process webhook retries that are due."""
         if self.is_processing:
             return
         
         self.is_processing = True
         
         try:
-            ready_retries = self.retry_manager.get_ready_retries()
-            
-            for delivery in ready_retries:
+            pending = []
+            for delivery in self.retry_manager.get_ready_retries():
                 endpoint = self.registry.get_endpoint(delivery.endpoint_id)
-                if not endpoint:
-                    continue
-                
-                success = await self.delivery_engine.deliver_webhook(endpoint, delivery)
-                
-                # Schedule another retry if failed
-                if not success and delivery.attempts < delivery.max_attempts:
-                    self.retry_manager.schedule_retry(delivery, endpoint)
+                if endpoint:
+                    pending.append((endpoint, delivery))
+            
+            if not pending:
+                return
             
-            if ready_retries:
-                logger.info("Processed webhook retries", count=len(ready_retries))
+            results = await asyncio.gather(
+                *(
+                    self.delivery_engine.deliver_webhook(endpoint, delivery)
+                    for endpoint, delivery in pending
+                ),
+                return_exceptions=True
+            )
+            self._handle_results(pending, results)
+            
+            logger.info("Processed webhook retries", count=len(pending))
                 
         except Exception as e:
             logger.error("Error processing webhook retries", error=str(e))
@@ -620,7 +895,7 @@ class WebhookService:
     
     def _generate_secret(self) -> str:
         """Generate webhook secret."""
-        return f"whs_{uuid.uuid4().hex}"
+        return f"whs_{secrets.token_urlsafe(32)}"
     
     async def test_endpoint(self, endpoint_id: str) -> Dict[str, Any]:
         """Test webhook endpoint with a ping event."""
@@ -636,7 +911,7 @@ class WebhookService:
         }
         
         delivery = WebhookDelivery(
-            id=f"test_{uuid.uuid4().hex[:12]}",
+            id=f"test_{secrets.token_hex(6)}",
             endpoint_id=endpoint.id,
             event_type=WebhookEvent.USER_UPDATED,  # Use generic event for testing
             payload=test_data,
@@ -655,6 +930,14 @@ class WebhookService:
     
     async def shutdown(self):
         """Shutdown webhook service."""
+        if self.retry_task is not None:
+            self.retry_task.cancel()
+            try:
+                await self.retry_task
+            except asyncio.CancelledError:
+                pass
+            self.retry_task = None
+        
         await self.delivery_engine.close()
         logger.info("Webhook service shut down")
 
@@ -74,4 +74,5 @@ ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 
 # Currency formatting
 CURRENCY_DECIMALS = 2
-AMOUNT_SCALE_FACTOR = 100  # Store amounts in centimos
\ No newline at end of file
+AMOUNT_SCALE_FACTOR = 100  # Store amounts in centimos
+MAX_AMOUNT_CENTIMOS = 100_000_000_000  # 1 billion euros
@@ -3,81 +3,83 @@ Custom exceptions for the application.
 All business logic and technical exceptions are defined here.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+# Shared by every exception raised without details; immutable so it can't leak between instances
+_EMPTY_DETAILS: tuple = ()
 
 
 class AppException(Exception):
-    """Base exception for all application exceptions."""
+    """Base exception for all application exceptions.
+    
+    Subclasses set CODE, STATUS and DEFAULT_MESSAGE instead of overriding
+    __init__; only those with extra arguments define their own.
+    """
+    
+    CODE = "UNKNOWN_ERROR"
+    STATUS = 500
+    DEFAULT_MESSAGE = "An unexpected error occurred"
+    
+    # Fixed layout; subclasses declare empty slots so no instance dict is created
+    __slots__ = ('message', 'code', 'status_code', 'details')
     
     def __init__(
         self,
-        message: str,
-        code: str = "UNKNOWN_ERROR",
-        status_code: int = 500,
+        message: Optional[str] = None,
+        *,
+        code: Optional[str] = None,
+        status_code: Optional[int] = None,
         details: Optional[List[str]] = None
     ):
-        self.message = message
-        self.code = code
-        self.status_code = status_code
-        self.details = details or []
+        self.message = message if message is not None else self.DEFAULT_MESSAGE
+        self.code = code or self.CODE
+        self.status_code = status_code or self.STATUS
+        self.details: Sequence[str] = details if details else _EMPTY_DETAILS
         super().__init__(self.message)
 
 
 class ValidationError(AppException):
     """Raised when input validation fails."""
     
-    def __init__(
-        self,
-        message: str = "Validation error",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code="VALIDATION_ERROR",
-            status_code=422,
-            details=details
-        )
+    CODE = "VALIDATION_ERROR"
+    STATUS = 422
+    DEFAULT_MESSAGE = "Validation error"
+    
+    __slots__ = ()
 
 
 class AuthenticationError(AppException):
     """Raised when authentication fails."""
     
-    def __init__(
-        self,
-        message: str = "Authentication failed",
-        code: str = "AUTHENTICATION_ERROR",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code=code,
-            status_code=401,
-            details=details
-        )
+    CODE = "AUTHENTICATION_ERROR"
+    STATUS = 401
+    DEFAULT_MESSAGE = "Authentication failed"
+    
+    __slots__ = ()
 
 
 class AuthorizationError(AppException):
     """Raised when authorization fails."""
     
-    def __init__(
-        self,
-        message: str = "Insufficient permissions",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code="AUTHORIZATION_ERROR",
-            status_code=403,
-            details=details
-        )
+    CODE = "AUTHORIZATION_ERROR"
+    STATUS = 403
+    DEFAULT_MESSAGE = "Insufficient permissions"
+    
+    __slots__ = ()
 
 
 class NotFoundError(AppException):
     """Raised when a resource is not found."""
     
+    CODE = "NOT_FOUND"
+    STATUS = 404
+    DEFAULT_MESSAGE = "Resource not found"
+    
+    __slots__ = ()
+    
     def __init__(
         self,
-        message: str = "Resource not found",
+        message: Optional[str] = None,
         resource_type: str = "resource",
         resource_id: Optional[str] = None
     ):
@@ -86,8 +88,6 @@ class NotFoundError(AppException):
         
         super().__init__(
             message=message,
-            code="NOT_FOUND",
-            status_code=404,
             details=[f"Resource type: {resource_type}"]
         )
 
@@ -95,64 +95,50 @@ class NotFoundError(AppException):
 class ConflictError(AppException):
     """Raised when a resource conflict occurs."""
     
-    def __init__(
-        self,
-        message: str = "Resource conflict",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code="CONFLICT_ERROR",
-            status_code=409,
-            details=details
-        )
+    CODE = "CONFLICT_ERROR"
+    STATUS = 409
+    DEFAULT_MESSAGE = "Resource conflict"
+    
+    __slots__ = ()
 
 
 class BusinessLogicError(AppException):
     """Raised when business logic rules are violated."""
     
-    def __init__(
-        self,
-        message: str = "Business logic error",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code="BUSINESS_LOGIC_ERROR",
-            status_code=422,
-            details=details
-        )
+    CODE = "BUSINESS_LOGIC_ERROR"
+    STATUS = 422
+    DEFAULT_MESSAGE = "Business logic error"
+    
+    __slots__ = ()
 
 
 class DatabaseError(AppException):
     """Raised when database operations fail."""
     
-    def __init__(
-        self,
-        message: str = "Database operation failed",
-        details: Optional[List[str]] = None
-    ):
-        super().__init__(
-            message=message,
-            code="DATABASE_ERROR",
-            status_code=500,
-            details=details
-        )
+    CODE = "DATABASE_ERROR"
+    STATUS = 500
+    DEFAULT_MESSAGE = "Database operation failed"
+    
+    __slots__ = ()
 
 
 class ExternalServiceError(AppException):
     """Raised when external service calls fail."""
     
+    CODE = "EXTERNAL_SERVICE_ERROR"
+    STATUS = 502
+    DEFAULT_MESSAGE = "External service error"
+    
+    __slots__ = ()
+    
     def __init__(
         self,
-        message: str = "External service error",
+        message: Optional[str] = None,
         service_name: str = "unknown",
         details: Optional[List[str]] = None
     ):
         super().__init__(
             message=message,
-            code="EXTERNAL_SERVICE_ERROR",
-            status_code=502,
             details=details or [f"Service: {service_name}"]
         )
 
@@ -160,9 +146,15 @@ class ExternalServiceError(AppException):
 class RateLimitError(AppException):
     """Raised when rate limits are exceeded."""
     
+    CODE = "RATE_LIMIT_ERROR"
+    STATUS = 429
+    DEFAULT_MESSAGE = "Rate limit exceeded"
+    
+    __slots__ = ()
+    
     def __init__(
         self,
-        message: str = "Rate limit exceeded",
+        message: Optional[str] = None,
         retry_after: Optional[int] = None
     ):
         details = []
@@ -171,7 +163,5 @@ class RateLimitError(AppException):
         
         super().__init__(
             message=message,
-            code="RATE_LIMIT_ERROR",
-            status_code=429,
             details=details
         )
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""
+Shared HTTP client capabilities.
+"""
+
+# HTTP/2 support requires the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
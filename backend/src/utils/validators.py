@@ -3,20 +3,37 @@ Custom validators for Pydantic models.
 """
 
 import re
+import string
+import zoneinfo
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
-from .constants import AMOUNT_SCALE_FACTOR
+from .constants import AMOUNT_SCALE_FACTOR, MAX_AMOUNT_CENTIMOS
+
+# Compiled once at import, with the match method pre-bound since
+# validators run on every request body
+_email_fullmatch = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}').fullmatch
+
+# Character classes for the hand-written scanners below
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_HEX_DIGITS = frozenset(string.hexdigits)
+_PASSWORD_SPECIALS = frozenset('!@#$%^&*(),.?":{}|<>')
+_SLUG_CHARS = _LOWERCASE | _DIGITS
 
 
 def validate_email(email: str) -> str:
     """Validate email format."""
     email = email.strip().lower()
     
-    # Basic email regex
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    # Cheap structural check first so obvious junk never reaches the regex
+    at = email.find('@')
+    if at < 1 or '.' not in email[at + 1:]:
+        raise ValueError("Invalid email format")
     
-    if not re.match(email_pattern, email):
+    if not _email_fullmatch(email):
         raise ValueError("Invalid email format")
     
     return email
@@ -27,17 +44,22 @@ def validate_amount_centimos(amount: int) -> int:
     if amount <= 0:
         raise ValueError("Amount must be positive")
     
-    # Check for reasonable upper limit (1 billion euros = 100 billion centimos)
-    if amount > 100_000_000_000:
+    # Check for reasonable upper limit
+    if amount > MAX_AMOUNT_CENTIMOS:
         raise ValueError("Amount too large")
     
     return amount
 
 
+@lru_cache(maxsize=32)
+def _max_future_date(today: date, max_days_future: int) -> date:
+    """Latest allowed date, memoized per day so the timedelta is built once."""
+    return today + timedelta(days=max_days_future)
+
+
 def validate_future_date(date_value: date, max_days_future: int = 1) -> date:
     """Validate that date is not too far in the future."""
-    today = date.today()
-    max_future_date = today + timedelta(days=max_days_future)
+    max_future_date = _max_future_date(date.today(), max_days_future)
     
     if date_value > max_future_date:
         raise ValueError(f"Date cannot be more than {max_days_future} day(s) in the future")
@@ -52,9 +74,8 @@ def validate_hex_color(color: str) -> str:
     if not color.startswith('#'):
         color = f"#{color}"
     
-    hex_pattern = r'^#[0-9A-Fa-f]{6}$'
-    
-    if not re.match(hex_pattern, color):
+    # int(..., 16) would also accept '0x', signs and underscores, so check each char
+    if len(color) != 7 or not all(char in _HEX_DIGITS for char in color[1:]):
         raise ValueError("Invalid hex color format. Use #RRGGBB")
     
     return color.upper()
@@ -62,8 +83,8 @@ def validate_hex_color(color: str) -> str:
 
 def validate_phone_number(phone: str) -> str:
     """Validate phone number format."""
-    # Remove all non-digit characters
-    phone_digits = re.sub(r'\D', '', phone)
+    # Remove all non-digit characters (isdecimal matches what \d did)
+    phone_digits = ''.join(filter(str.isdecimal, phone))
     
     # Check length (7-15 digits as per international standards)
     if len(phone_digits) < 7 or len(phone_digits) > 15:
@@ -77,29 +98,55 @@ def validate_password_strength(password: str) -> str:
     if len(password) < 8:
         raise ValueError("Password must be at least 8 characters long")
     
-    if not re.search(r'[A-Z]', password):
+    # One pass over the password instead of a regex search per character class.
+    # Letters are matched as ASCII, as the previous [A-Z]/[a-z] patterns did,
+    # and digits as any Unicode decimal digit, as \d did.
+    has_upper = has_lower = has_digit = has_special = False
+    for char in password:
+        if char in _UPPERCASE:
+            has_upper = True
+        elif char in _LOWERCASE:
+            has_lower = True
+        elif char.isdecimal():
+            has_digit = True
+        elif char in _PASSWORD_SPECIALS:
+            has_special = True
+    
+    if not has_upper:
         raise ValueError("Password must contain at least one uppercase letter")
     
-    if not re.search(r'[a-z]', password):
+    if not has_lower:
         raise ValueError("Password must contain at least one lowercase letter")
     
-    if not re.search(r'\d', password):
+    if not has_digit:
         raise ValueError("Password must contain at least one digit")
     
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if not has_special:
         raise ValueError("Password must contain at least one special character")
     
     return password
 
 
+def _is_slug(slug: str) -> bool:
+    """Match ^[a-z0-9]+(?:-[a-z0-9]+)*$ with a single character scan."""
+    # Starting as if after a hyphen rejects a leading hyphen and the empty string
+    after_hyphen = True
+    for char in slug:
+        if char in _SLUG_CHARS:
+            after_hyphen = False
+        elif char == '-' and not after_hyphen:
+            after_hyphen = True
+        else:
+            return False
+    return not after_hyphen
+
+
 def validate_slug(slug: str) -> str:
     """Validate URL slug format."""
     slug = slug.strip().lower()
     
     # Check basic format
-    slug_pattern = r'^[a-z0-9]+(?:-[a-z0-9]+)*$'
-    
-    if not re.match(slug_pattern, slug):
+    if not _is_slug(slug):
         raise ValueError("Slug must contain only lowercase letters, numbers, and hyphens")
     
     if len(slug) < 3 or len(slug) > 50:
@@ -112,7 +159,8 @@ def validate_bank_last_four_digits(digits: str) -> str:
     """Validate bank card last four digits."""
     digits = digits.strip()
     
-    if not re.match(r'^\d{4}$', digits):
+    # ASCII only; isdigit() alone also accepts characters such as "١" or "²"
+    if len(digits) != 4 or not (digits.isascii() and digits.isdigit()):
         raise ValueError("Must be exactly 4 digits")
     
     return digits
@@ -120,13 +168,18 @@ def validate_bank_last_four_digits(digits: str) -> str:
 
 def validate_amount_euros(amount: float) -> int:
     """Convert and validate amount from euros to centimos."""
-    if amount <= 0:
+    # Range-check the converted value directly rather than delegating to
+    # validate_amount_centimos; checking after rounding still rejects
+    # sub-centimo amounts that round to zero
+    centimos = int(round(amount * AMOUNT_SCALE_FACTOR))
+    
+    if centimos <= 0:
         raise ValueError("Amount must be positive")
     
-    # Convert to centimos
-    centimos = int(round(amount * AMOUNT_SCALE_FACTOR))
+    if centimos > MAX_AMOUNT_CENTIMOS:
+        raise ValueError("Amount too large")
     
-    return validate_amount_centimos(centimos)
+    return centimos
 
 
 def validate_percentage(percentage: float) -> float:
@@ -137,14 +190,22 @@ def validate_percentage(percentage: float) -> float:
     return percentage
 
 
-def validate_timezone(timezone: str) -> str:
-    """Validate timezone string."""
+@lru_cache(maxsize=512)
+def _is_known_timezone(timezone: str) -> bool:
+    """Check a timezone against tzdata, memoized to avoid repeated file reads."""
     try:
-        import zoneinfo
         zoneinfo.ZoneInfo(timezone)
-        return timezone
+        return True
     except Exception:
-        # Fallback to basic validation
-        if '/' not in timezone:
-            raise ValueError("Invalid timezone format")
-        return timezone
\ No newline at end of file
+        return False
+
+
+def validate_timezone(timezone: str) -> str:
+    """Validate timezone string."""
+    if _is_known_timezone(timezone):
+        return timezone
+    
+    # Fallback to basic validation
+    if '/' not in timezone:
+        raise ValueError("Invalid timezone format")
+    return timezone
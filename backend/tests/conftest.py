@@ -4,15 +4,24 @@ Global pytest configuration and fixtures.
 
 import os
 import asyncio
-from typing import AsyncGenerator, Generator
-from unittest.mock import patch, MagicMock
+from typing import TYPE_CHECKING, AsyncGenerator, Generator
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from fastapi.testclient import TestClient
-from httpx import AsyncClient
+import pytest_asyncio
+
+# Must be set before src.config builds its module-level settings, so the app
+# skips service startup under test (pytest-env may not have loaded pytest.ini)
+os.environ.setdefault("ENVIRONMENT", "testing")
 
 from src.config import Settings, get_settings
 
+if TYPE_CHECKING:
+    # Imported inside the client fixtures so test runs that don't use them
+    # skip loading the HTTP client stacks at collection time
+    from fastapi.testclient import TestClient
+    from httpx import AsyncClient
+
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
@@ -44,7 +53,7 @@ def test_settings() -> Settings:
         
         # API
         api_prefix="/api/v1",
-        cors_origins=["http://localhost:3000"],
+        cors_origins="http://localhost:3000",
         rate_limit_per_minute=1000,  # High limit for testing
         
         # External
@@ -69,82 +78,169 @@ def app_with_test_settings(test_settings):
         return create_app()
 
 
-@pytest.fixture
-def client(app_with_test_settings) -> TestClient:
-    """Synchronous test client."""
-    return TestClient(app_with_test_settings)
-
-
-@pytest.fixture
-async def async_client(app_with_test_settings) -> AsyncGenerator[AsyncClient, None]:
-    """Asynchronous test client."""
+@pytest.fixture(scope="session")
+def client(app_with_test_settings) -> Generator["TestClient", None, None]:
+    """Synchronous test client, shared by the whole session."""
+    from fastapi.testclient import TestClient
+    test_client = TestClient(app_with_test_settings)
+    # Pay the first-request cost (lazy imports, response schema compilation)
+    # here instead of in whichever test happens to run first
+    test_client.get("/api/v1/health")
+    yield test_client
+    test_client.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client(app_with_test_settings) -> AsyncGenerator["AsyncClient", None]:
+    """Asynchronous test client, shared by the whole session (uses the session event_loop)."""
+    from httpx import ASGITransport, AsyncClient
     async with AsyncClient(
-        app=app_with_test_settings,
+        transport=ASGITransport(app=app_with_test_settings),
         base_url="http://testserver"
     ) as ac:
         yield ac
 
 
 @pytest.fixture
-def mock_firestore():
+def mock_firestore(monkeypatch):
     """Mock Firestore client."""
-    with patch('src.infrastructure.firestore_client.FirestoreClient') as mock:
-        mock_instance = MagicMock()
-        mock.return_value = mock_instance
-        
-        # Configure common mock methods
-        mock_instance.initialize = MagicMock()
-        mock_instance.create_document = MagicMock()
-        mock_instance.get_document = MagicMock()
-        mock_instance.update_document = MagicMock()
-        mock_instance.delete_document = MagicMock()
-        mock_instance.query_documents = MagicMock()
-        mock_instance.transaction_write = MagicMock()
-        
-        yield mock_instance
+    mock_instance = MagicMock()
+    
+    # Configure common mock methods
+    mock_instance.initialize = MagicMock()
+    mock_instance.create_document = AsyncMock()
+    mock_instance.get_document = AsyncMock()
+    mock_instance.update_document = AsyncMock()
+    mock_instance.delete_document = AsyncMock()
+    mock_instance.query_documents = AsyncMock()
+    mock_instance.transaction_write = MagicMock()
+    
+    monkeypatch.setattr(
+        'src.infrastructure.firestore_client.FirestoreClient',
+        lambda *args, **kwargs: mock_instance
+    )
+    return mock_instance
 
 
 @pytest.fixture
-def mock_google_auth():
+def mock_google_auth(monkeypatch):
     """Mock Google auth client."""
-    with patch('src.infrastructure.auth_client.GoogleAuthClient') as mock:
-        mock_instance = MagicMock()
-        mock.return_value = mock_instance
-        
-        # Default successful verification
-        mock_instance.verify_id_token.return_value = {
-            "sub": "google_user_123",
-            "email": "test@example.com",
-            "email_verified": True,
-            "name": "Test User",
-            "picture": "https://example.com/avatar.jpg"
-        }
-        
-        yield mock_instance
+    mock_instance = MagicMock()
+    
+    # Default successful verification
+    mock_instance.verify_id_token.return_value = {
+        "sub": "google_user_123",
+        "email": "test@example.com",
+        "email_verified": True,
+        "name": "Test User",
+        "picture": "https://example.com/avatar.jpg"
+    }
+    
+    monkeypatch.setattr(
+        'src.infrastructure.auth_client.GoogleAuthClient',
+        lambda *args, **kwargs: mock_instance
+    )
+    return mock_instance
+
+
+def _build_auth_identity(user_id: str, email: str, role):
+    """A real User and its Session, as the routers receive them."""
+    from datetime import datetime, timedelta
+    from src.models.auth import Session, User
+    
+    user = User(
+        id=user_id,
+        email=email,
+        password_hash="hashed_password",
+        name="Test User",
+        role=role
+    )
+    session = Session(
+        id=f"session_{user_id}",
+        user_id=user_id,
+        jti=f"jti_{user_id}",
+        expires_at=datetime.utcnow() + timedelta(hours=1)
+    )
+    return user, session
+
+
+def _override_current_user(app, user, session):
+    """Resolve the current user via dependency overrides.
+    
+    auth.get_current_user yields a (user, session) tuple; the financial
+    routers define their own get_current_user that yields the User alone.
+    Direct dict assignment is much cheaper than patch() start/stop.
+    """
+    from src.routers import accounts, auth, categories, import_export, transactions
+    
+    overrides = {
+        auth.get_current_user: lambda: (user, session),
+        accounts.get_current_user: lambda: user,
+        categories.get_current_user: lambda: user,
+        import_export.get_current_user: lambda: user,
+        transactions.get_current_user: lambda: user
+    }
+    app.dependency_overrides.update(overrides)
+    yield user
+    for dependency in overrides:
+        app.dependency_overrides.pop(dependency, None)
 
 
 @pytest.fixture
-def mock_auth_middleware():
-    """Mock authentication middleware."""
-    with patch('src.middleware.auth.get_current_user') as mock:
-        mock.return_value = {
-            "uid": "test_user_123",
-            "email": "test@example.com",
-            "role": "user"
-        }
-        yield mock
+def mock_auth_middleware(app_with_test_settings):
+    """Authenticate requests as a regular user."""
+    from src.models.auth import UserRole
+    
+    yield from _override_current_user(
+        app_with_test_settings,
+        *_build_auth_identity("test_user_123", "test@example.com", UserRole.USER)
+    )
 
 
 @pytest.fixture
-def mock_admin_auth_middleware():
-    """Mock admin authentication middleware."""
-    with patch('src.middleware.auth.get_current_user') as mock:
-        mock.return_value = {
-            "uid": "test_admin_123",
-            "email": "admin@example.com",
-            "role": "admin"
-        }
-        yield mock
+def mock_admin_auth_middleware(app_with_test_settings):
+    """Authenticate requests as an admin user."""
+    from src.models.auth import UserRole
+    
+    yield from _override_current_user(
+        app_with_test_settings,
+        *_build_auth_identity("test_admin_123", "admin@example.com", UserRole.ADMIN)
+    )
+
+
+@pytest.fixture(scope="module")
+def mock_health_checker(app_with_test_settings):
+    """Healthy HealthChecker mock, built once per module.
+    
+    Tests needing a different report set get_comprehensive_health.return_value.
+    """
+    from src.middleware.monitoring import get_health_checker
+    
+    checker = AsyncMock()
+    checker.get_comprehensive_health.return_value = {
+        "overall_status": "healthy",
+        "firestore": {"status": "healthy"},
+        "external_apis": {"asana": {"status": "healthy"}}
+    }
+    app_with_test_settings.dependency_overrides[get_health_checker] = lambda: checker
+    
+    yield checker
+    
+    app_with_test_settings.dependency_overrides.pop(get_health_checker, None)
+
+
+@pytest.fixture(scope="module")
+def mock_rate_limiter():
+    """Rate limiter mock for the monitoring router, built once per module."""
+    limiter = AsyncMock()
+    limiter.get_rate_limit_status.return_value = {
+        "active_sliding_windows": 5,
+        "active_token_buckets": 3
+    }
+    # The router calls get_rate_limiter() directly rather than via Depends
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr("src.routers.monitoring.get_rate_limiter", lambda: limiter)
+        yield limiter
 
 
 @pytest.fixture
@@ -260,6 +356,23 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "security: Security-focused tests")
 
 
+def pytest_addoption(parser):
+    """Add the --runslow option."""
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run tests marked as slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --runslow is given."""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
 # Test utilities
 class TestDatabase:
     """Utilities for database testing."""
@@ -299,12 +412,13 @@ class TestDatabase:
     
     def clear_collection(self, collection: str):
         """Clear a collection in mock database."""
+        # Swap in a new dict rather than emptying the old one in place
         if collection in self.collections:
-            self.collections[collection].clear()
+            self.collections[collection] = {}
     
     def clear_all(self):
         """Clear all collections in mock database."""
-        self.collections.clear()
+        self.collections = {}
 
 
 @pytest.fixture
@@ -3,109 +3,115 @@ Factory for Financial model testing.
 """
 
 import factory
-from datetime import date, datetime, timedelta
+import factory.random
+from datetime import date, timedelta
 from faker import Faker
 
+from .timestamps import now_iso
+
 fake = Faker()
+# factory_boy's shared generator: cheaper than Faker's provider dispatch for
+# plain ints, and still reseeded by factory.random.reseed_random()
+_rng = factory.random.randgen
 
 
 class AccountFactory(factory.DictFactory):
     """Factory for Account model."""
     
-    id = factory.Sequence(lambda n: f"acc_{n:06d}")
+    id = factory.Sequence("acc_%06d".__mod__)
     name = factory.Faker("company")
     type = factory.Iterator(["bank", "cash", "card"])
     bank_name = factory.LazyAttribute(
         lambda obj: fake.company() if obj.type == "bank" else None
     )
     last_four_digits = factory.LazyAttribute(
-        lambda obj: f"{fake.random_int(min=1000, max=9999)}" if obj.type in ["bank", "card"] else None
+        lambda obj: f"{_rng.randint(1000, 9999)}" if obj.type in ["bank", "card"] else None
     )
     currency = "EUR"
-    balance = factory.LazyFunction(lambda: fake.random_int(min=0, max=1000000))
+    balance = factory.LazyFunction(lambda: _rng.randint(0, 1000000))
     is_default = False
     is_active = True
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
-    updated_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
+    updated_at = factory.SelfAttribute('created_at')
 
 
 class CategoryFactory(factory.DictFactory):
     """Factory for Category model."""
     
-    id = factory.Sequence(lambda n: f"cat_{n:06d}")
+    id = factory.Sequence("cat_%06d".__mod__)
     name = factory.Faker("word")
     type = factory.Iterator(["income", "expense"])
     parent_id = None
     icon = factory.Iterator(["folder", "shopping_cart", "restaurant", "work", "home"])
-    color = factory.LazyFunction(lambda: fake.hex_color())
+    color = factory.LazyFunction(lambda: f"#{_rng.randrange(0x1000000):06x}")
     is_active = True
     transaction_count = 0
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
 
 
 class TransactionFactory(factory.DictFactory):
     """Factory for Transaction model."""
     
-    id = factory.Sequence(lambda n: f"txn_{n:06d}")
+    id = factory.Sequence("txn_%06d".__mod__)
     type = factory.Iterator(["income", "expense"])
-    amount = factory.LazyFunction(lambda: fake.random_int(min=100, max=100000))
+    amount = factory.LazyFunction(lambda: _rng.randint(100, 100000))
     currency = "EUR"
     description = factory.Faker("sentence", nb_words=3)
     date = factory.LazyFunction(
-        lambda: (date.today() - timedelta(days=fake.random_int(min=0, max=30))).isoformat()
+        lambda: (date.today() - timedelta(days=_rng.randint(0, 30))).isoformat()
     )
-    category_id = factory.Sequence(lambda n: f"cat_{n:06d}")
-    account_id = factory.Sequence(lambda n: f"acc_{n:06d}")
+    category_id = factory.Sequence("cat_%06d".__mod__)
+    account_id = factory.Sequence("acc_%06d".__mod__)
     tags = factory.LazyFunction(
-        lambda: [fake.word() for _ in range(fake.random_int(min=0, max=3))]
+        lambda: [fake.word() for _ in range(_rng.randint(0, 3))]
     )
     external_ref = None
     attachments = []
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
-    updated_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
+    updated_at = factory.SelfAttribute('created_at')
 
 
 class ExpenseTransactionFactory(TransactionFactory):
     """Factory for expense transactions."""
     
     type = "expense"
-    amount = factory.LazyFunction(lambda: fake.random_int(min=500, max=20000))
+    amount = factory.LazyFunction(lambda: _rng.randint(500, 20000))
 
 
 class IncomeTransactionFactory(TransactionFactory):
     """Factory for income transactions."""
     
     type = "income"
-    amount = factory.LazyFunction(lambda: fake.random_int(min=50000, max=500000))
+    amount = factory.LazyFunction(lambda: _rng.randint(50000, 500000))
 
 
 class AsanaTransactionFactory(TransactionFactory):
     """Factory for transactions from Asana."""
     
-    external_ref = factory.Sequence(lambda n: f"asana_task_{n:06d}")
+    external_ref = factory.Sequence("asana_task_%06d".__mod__)
     description = factory.LazyAttribute(lambda obj: f"Asana: {fake.sentence(nb_words=3)}")
 
 
 class BudgetFactory(factory.DictFactory):
     """Factory for Budget model."""
     
-    id = factory.Sequence(lambda n: f"bud_{n:06d}")
-    category_id = factory.Sequence(lambda n: f"cat_{n:06d}")
+    id = factory.Sequence("bud_%06d".__mod__)
+    category_id = factory.Sequence("cat_%06d".__mod__)
     period = factory.LazyFunction(lambda: date.today().strftime("%Y-%m"))
     period_type = "monthly"
-    limit_amount = factory.LazyFunction(lambda: fake.random_int(min=10000, max=100000))
-    spent_amount = factory.LazyFunction(lambda: fake.random_int(min=0, max=50000))
+    limit_amount = factory.LazyFunction(lambda: _rng.randint(10000, 100000))
+    spent_amount = factory.LazyFunction(lambda: _rng.randint(0, 50000))
     is_active = True
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
 
 
 class FixedItemFactory(factory.DictFactory):
     """Factory for Fixed Item model."""
     
-    id = factory.Sequence(lambda n: f"fix_{n:06d}")
+    id = factory.Sequence("fix_%06d".__mod__)
     name = factory.Faker("sentence", nb_words=2)
     type = factory.Iterator(["income", "expense"])
-    amount = factory.LazyFunction(lambda: fake.random_int(min=10000, max=200000))
+    amount = factory.LazyFunction(lambda: _rng.randint(10000, 200000))
     currency = "EUR"
     frequency = factory.Iterator(["weekly", "monthly", "yearly"])
     start_date = factory.LazyFunction(lambda: date.today().isoformat())
@@ -113,23 +119,23 @@ class FixedItemFactory(factory.DictFactory):
     next_occurrence = factory.LazyFunction(
         lambda: (date.today() + timedelta(days=30)).isoformat()
     )
-    category_id = factory.Sequence(lambda n: f"cat_{n:06d}")
-    account_id = factory.Sequence(lambda n: f"acc_{n:06d}")
+    category_id = factory.Sequence("cat_%06d".__mod__)
+    account_id = factory.Sequence("acc_%06d".__mod__)
     is_active = True
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
 
 
 class SavingsProjectFactory(factory.DictFactory):
     """Factory for Savings Project model."""
     
-    id = factory.Sequence(lambda n: f"sav_{n:06d}")
+    id = factory.Sequence("sav_%06d".__mod__)
     name = factory.Faker("sentence", nb_words=2)
     description = factory.Faker("text", max_nb_chars=200)
-    target_amount = factory.LazyFunction(lambda: fake.random_int(min=100000, max=1000000))
-    current_amount = factory.LazyFunction(lambda: fake.random_int(min=0, max=50000))
+    target_amount = factory.LazyFunction(lambda: _rng.randint(100000, 1000000))
+    current_amount = factory.LazyFunction(lambda: _rng.randint(0, 50000))
     priority = factory.Iterator([1, 2, 3])
     target_date = factory.LazyFunction(
         lambda: (date.today() + timedelta(days=365)).isoformat()
     )
     status = "active"
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
\ No newline at end of file
+    created_at = factory.LazyFunction(now_iso)
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Shared timestamps for factory fields.
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _iso_for_millisecond(millisecond: int) -> str:
+    """Format the current UTC time once per millisecond bucket."""
+    return datetime.utcnow().isoformat()
+
+
+def now_iso() -> str:
+    """Current UTC time as ISO string, shared by every object built in the same millisecond."""
+    return _iso_for_millisecond(time.monotonic_ns() // 1_000_000)
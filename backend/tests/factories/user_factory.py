@@ -3,10 +3,16 @@ Factory for User model testing.
 """
 
 import factory
+import factory.random
 from datetime import datetime, timedelta
 from faker import Faker
 
+from .timestamps import now_iso
+
 fake = Faker()
+# factory_boy's shared generator: cheaper than Faker's provider dispatch for
+# plain ints, and still reseeded by factory.random.reseed_random()
+_rng = factory.random.randgen
 
 
 class UserPreferencesFactory(factory.DictFactory):
@@ -20,29 +26,29 @@ class UserPreferencesFactory(factory.DictFactory):
 class SavingsConfigFactory(factory.DictFactory):
     """Factory for savings configuration."""
     
-    minimum_fixed_amount = factory.LazyFunction(lambda: fake.random_int(min=10000, max=100000))
-    target_percentage = factory.LazyFunction(lambda: fake.random_int(min=10, max=50))
+    minimum_fixed_amount = factory.LazyFunction(lambda: _rng.randint(10000, 100000))
+    target_percentage = factory.LazyFunction(lambda: _rng.randint(10, 50))
 
 
 class UserFactory(factory.DictFactory):
     """Factory for User model."""
     
-    uid = factory.Sequence(lambda n: f"user_{n:04d}")
+    uid = factory.Sequence("user_%04d".__mod__)
     email = factory.LazyAttribute(lambda obj: f"{obj.uid}@example.com")
     display_name = factory.Faker("name")
     role = "user"
     preferences = factory.SubFactory(UserPreferencesFactory)
     savings_config = factory.SubFactory(SavingsConfigFactory)
     is_active = True
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
-    updated_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
+    created_at = factory.LazyFunction(now_iso)
+    updated_at = factory.SelfAttribute('created_at')
     last_login = None
 
 
 class AdminUserFactory(UserFactory):
     """Factory for admin user."""
     
-    uid = factory.Sequence(lambda n: f"admin_{n:04d}")
+    uid = factory.Sequence("admin_%04d".__mod__)
     role = "admin"
     display_name = "Admin User"
 
@@ -50,13 +56,13 @@ class AdminUserFactory(UserFactory):
 class InvitationFactory(factory.DictFactory):
     """Factory for Invitation model."""
     
-    code = factory.Sequence(lambda n: f"INV_{n:08X}")
+    code = factory.Sequence("INV_%08X".__mod__)
     email = factory.Faker("email")
-    issued_by = factory.LazyFunction(lambda: f"admin_{fake.random_int(min=1, max=999):04d}")
+    issued_by = factory.LazyFunction(lambda: f"admin_{_rng.randint(1, 999):04d}")
     status = "pending"
     expires_at = factory.LazyFunction(
         lambda: (datetime.utcnow() + timedelta(days=7)).isoformat()
     )
     consumed_by = None
     consumed_at = None
-    created_at = factory.LazyFunction(lambda: datetime.utcnow().isoformat())
\ No newline at end of file
+    created_at = factory.LazyFunction(now_iso)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Routes that must reject unauthenticated requests, shared by the integration tests.
+"""
+
+# The financial routers check the Authorization header themselves
+HEADER_REQUIRED = "Authorization header required"
+# HTTPBearer rejects a missing header with 403 on FastAPI 0.104
+NOT_AUTHENTICATED = "Not authenticated"
+
+# (method, path, area, expected status, expected detail)
+PROTECTED_ROUTES = [
+    ("GET", "/api/v1/accounts", "financial", 401, HEADER_REQUIRED),
+    ("POST", "/api/v1/accounts", "financial", 401, HEADER_REQUIRED),
+    ("GET", "/api/v1/categories", "financial", 401, HEADER_REQUIRED),
+    ("POST", "/api/v1/categories", "financial", 401, HEADER_REQUIRED),
+    ("GET", "/api/v1/transactions", "financial", 401, HEADER_REQUIRED),
+    ("POST", "/api/v1/transactions", "financial", 401, HEADER_REQUIRED),
+    ("GET", "/api/v1/budgets", "financial", 403, NOT_AUTHENTICATED),
+    ("POST", "/api/v1/budgets", "financial", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/backup/config", "backup", 403, NOT_AUTHENTICATED),
+    ("PUT", "/api/v1/backup/config", "backup", 403, NOT_AUTHENTICATED),
+    ("POST", "/api/v1/backup/trigger", "backup", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/backup/list", "backup", 403, NOT_AUTHENTICATED),
+    ("POST", "/api/v1/backup/export", "backup", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/backup/exports", "backup", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/asana/workspaces", "asana", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/asana/projects", "asana", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/asana/task-mappings", "asana", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/asana/integration", "asana", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/monitoring/system/status", "admin", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/monitoring/system/performance", "admin", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/monitoring/system/users", "admin", 403, NOT_AUTHENTICATED),
+    ("GET", "/api/v1/monitoring/system/database/stats", "admin", 403, NOT_AUTHENTICATED)
+]
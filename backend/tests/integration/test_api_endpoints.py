@@ -3,13 +3,135 @@ Integration tests for API endpoints.
 """
 import pytest
 from datetime import datetime, timedelta
-from unittest.mock import patch, AsyncMock, MagicMock
+from decimal import Decimal
+from unittest.mock import AsyncMock
 
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
-from src.models.backup import BackupType, BackupDestination
-from src.models.financial import TransactionType
+from src.models.backup import (
+    BackupDestination, BackupRecordResponse, BackupStatus, BackupType,
+    ExportFormat, ExportRecordResponse, ExportType
+)
+from src.models.financial import AccountSummary, AccountType, TransactionSummary, TransactionType
+
+from ._routes import PROTECTED_ROUTES
+
+# Fixed timestamp for fake service results, so their fields agree with each other
+NOW = datetime(2024, 1, 15, 12, 0, 0)
+
+FAKE_BACKUP = BackupRecordResponse(
+    id="backup_123",
+    user_id="test_user_123",
+    backup_type=BackupType.MANUAL,
+    status=BackupStatus.COMPLETED,
+    destinations=[BackupDestination.LOCAL_STORAGE],
+    started_at=NOW,
+    completed_at=NOW,
+    duration_seconds=5.0,
+    error_message=None,
+    expires_at=NOW + timedelta(days=30),
+    created_at=NOW,
+    metadata=None
+)
+
+FAKE_EXPORT = ExportRecordResponse(
+    id="export_123",
+    user_id="test_user_123",
+    export_type=ExportType.FULL_BACKUP,
+    format=ExportFormat.JSON,
+    status=BackupStatus.COMPLETED,
+    file_size_bytes=1024,
+    download_url="/api/v1/backup/exports/export_123/download",
+    expires_at=NOW + timedelta(hours=24),
+    metadata=None,
+    started_at=NOW,
+    completed_at=NOW,
+    duration_seconds=2.5,
+    error_message=None,
+    created_at=NOW
+)
+
+FAKE_ACCOUNTS = [
+    AccountSummary(
+        id="acc_1",
+        name="Test Account",
+        account_type=AccountType.CHECKING,
+        balance=Decimal("10000"),
+        currency="EUR",
+        description=None,
+        is_active=True,
+        color=None,
+        icon=None
+    )
+]
+
+FAKE_TRANSACTIONS = [
+    TransactionSummary(
+        id="txn_1",
+        transaction_type=TransactionType.EXPENSE,
+        amount=Decimal("2500"),
+        description="Test Transaction",
+        transaction_date=NOW
+    )
+]
+
+class FakeBackupService:
+    async def trigger_backup(self, *args, **kwargs):
+        return FAKE_BACKUP
+
+
+class FakeExportService:
+    async def create_export(self, *args, **kwargs):
+        return FAKE_EXPORT
+
+
+class FakeAccountService:
+    async def list_accounts(self, *args, **kwargs):
+        return FAKE_ACCOUNTS
+
+
+class FakeTransactionService:
+    async def list_transactions(self, *args, **kwargs):
+        return FAKE_TRANSACTIONS
+
+
+class FakeAsanaIntegrationService:
+    async def get_integration(self, *args, **kwargs):
+        return None  # No Asana account connected yet
+
+
+@pytest.fixture
+def fake_services(app_with_test_settings):
+    """Inject the fake services above in place of the real router dependencies."""
+    from src.services.account import get_account_service
+    from src.services.asana_integration import get_asana_integration_service
+    from src.services.backup import get_backup_service
+    from src.services.export import get_export_service
+    from src.services.transaction import get_transaction_service
+    
+    fakes = {
+        get_account_service: FakeAccountService(),
+        get_asana_integration_service: FakeAsanaIntegrationService(),
+        get_backup_service: FakeBackupService(),
+        get_export_service: FakeExportService(),
+        get_transaction_service: FakeTransactionService()
+    }
+    overrides = app_with_test_settings.dependency_overrides
+    for getter, fake in fakes.items():
+        overrides[getter] = lambda fake=fake: fake
+    
+    yield
+    
+    for getter in fakes:
+        overrides.pop(getter, None)
+
+
+@pytest.fixture(scope="module")
+def metrics_response(client):
+    """Scrape the Prometheus metrics once per module, after a request has been counted."""
+    client.get("/api/v1/health")
+    return client.get("/api/v1/monitoring/metrics")
 
 
 @pytest.mark.integration
@@ -28,34 +150,24 @@ class TestHealthEndpoints:
         assert "environment" in data
         assert "app_name" in data
     
-    @pytest.mark.asyncio
-    async def test_monitoring_health_endpoints(self, async_client):
+    def test_monitoring_health_endpoints(self, client, mock_health_checker):
         """Test monitoring health endpoints."""
         # Basic monitoring health
-        response = await async_client.get("/api/v1/monitoring/health")
+        response = client.get("/api/v1/monitoring/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert data["service"] == "financial-nomad-backend"
         
         # Detailed health check
-        with patch('src.middleware.monitoring.get_health_checker') as mock_get_checker:
-            mock_checker = AsyncMock()
-            mock_checker.get_comprehensive_health.return_value = {
-                "overall_status": "healthy",
-                "firestore": {"status": "healthy"},
-                "external_apis": {"asana": {"status": "healthy"}}
-            }
-            mock_get_checker.return_value = mock_checker
-            
-            response = await async_client.get("/api/v1/monitoring/health/detailed")
-            assert response.status_code == 200
-            data = response.json()
-            assert data["overall_status"] == "healthy"
+        response = client.get("/api/v1/monitoring/health/detailed")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["overall_status"] == "healthy"
     
-    def test_prometheus_metrics_endpoint(self, client):
+    def test_prometheus_metrics_endpoint(self, metrics_response):
         """Test Prometheus metrics endpoint."""
-        response = client.get("/api/v1/monitoring/metrics")
+        response = metrics_response
         
         assert response.status_code == 200
         assert response.headers["content-type"] == "text/plain; charset=utf-8"
@@ -70,23 +182,16 @@ class TestHealthEndpoints:
 class TestAuthenticationFlow:
     """Integration tests for authentication flow."""
     
-    @pytest.mark.asyncio
-    async def test_auth_endpoints_without_token(self, async_client):
+    @pytest.mark.parametrize(
+        ("method", "endpoint", "expected_status", "expected_detail"),
+        [(method, path, status, detail) for method, path, _, status, detail in PROTECTED_ROUTES],
+        ids=[f"{area}-{method}-{path}" for method, path, area, _, _ in PROTECTED_ROUTES]
+    )
+    def test_requires_auth(self, client, method, endpoint, expected_status, expected_detail):
         """Test that protected endpoints require authentication."""
-        protected_endpoints = [
-            "/api/v1/accounts",
-            "/api/v1/categories", 
-            "/api/v1/transactions",
-            "/api/v1/budgets",
-            "/api/v1/backup/config",
-            "/api/v1/asana/workspaces"
-        ]
-        
-        for endpoint in protected_endpoints:
-            response = await async_client.get(endpoint)
-            assert response.status_code == 401
-            data = response.json()
-            assert "Not authenticated" in data["detail"] or "Authentication required" in data["detail"]
+        response = client.request(method, endpoint, json={} if method != "GET" else None)
+        assert response.status_code == expected_status
+        assert response.json()["detail"] == expected_detail
     
     def test_login_endpoint_exists(self, client):
         """Test that login endpoint exists and handles requests."""
@@ -104,283 +209,117 @@ class TestAuthenticationFlow:
 class TestBackupEndpoints:
     """Integration tests for backup and export endpoints."""
     
-    def test_backup_endpoints_require_auth(self, client):
-        """Test backup endpoints require authentication."""
-        endpoints = [
-            ("GET", "/api/v1/backup/config"),
-            ("PUT", "/api/v1/backup/config"),
-            ("POST", "/api/v1/backup/trigger"),
-            ("GET", "/api/v1/backup/list"),
-            ("POST", "/api/v1/backup/export"),
-            ("GET", "/api/v1/backup/exports")
-        ]
-        
-        for method, endpoint in endpoints:
-            if method == "GET":
-                response = client.get(endpoint)
-            elif method == "POST":
-                response = client.post(endpoint, json={})
-            elif method == "PUT":
-                response = client.put(endpoint, json={})
-            
-            assert response.status_code == 401
-    
-    @pytest.mark.asyncio
-    async def test_backup_trigger_with_auth(self, async_client, mock_auth_middleware):
+    def test_backup_trigger_with_auth(self, client, mock_auth_middleware, fake_services):
         """Test backup trigger with authentication."""
-        with patch('src.services.backup.get_backup_service') as mock_get_service:
-            mock_service = AsyncMock()
-            mock_service.trigger_backup.return_value = MagicMock(
-                id="backup_123",
-                user_id="test_user_123",
-                backup_type=BackupType.MANUAL,
-                status="completed",
-                destinations=[BackupDestination.LOCAL_STORAGE],
-                started_at=datetime.utcnow(),
-                completed_at=datetime.utcnow(),
-                duration_seconds=5.0,
-                error_message=None,
-                expires_at=datetime.utcnow() + timedelta(days=30),
-                created_at=datetime.utcnow(),
-                metadata=None
-            )
-            mock_get_service.return_value = mock_service
-            
-            backup_request = {
-                "backup_type": "manual",
-                "destinations": ["local_storage"],
-                "include_attachments": True,
-                "notify_on_completion": False
-            }
-            
-            response = await async_client.post("/api/v1/backup/trigger", json=backup_request)
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["id"] == "backup_123"
-            assert data["backup_type"] == "manual"
-            assert data["status"] == "completed"
+        backup_request = {
+            "backup_type": "manual",
+            "destinations": ["local_storage"],
+            "include_attachments": True,
+            "notify_on_completion": False
+        }
+        
+        response = client.post("/api/v1/backup/trigger", json=backup_request)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["id"] == "backup_123"
+        assert data["backup_type"] == "manual"
+        assert data["status"] == "completed"
     
-    @pytest.mark.asyncio
-    async def test_export_creation_with_auth(self, async_client, mock_auth_middleware):
+    def test_export_creation_with_auth(self, client, mock_auth_middleware, fake_services):
         """Test export creation with authentication."""
-        with patch('src.services.export.get_export_service') as mock_get_service:
-            mock_service = AsyncMock()
-            mock_service.create_export.return_value = MagicMock(
-                id="export_123",
-                user_id="test_user_123",
-                export_type="full_backup",
-                format="json",
-                status="completed",
-                file_size_bytes=1024,
-                download_url="/api/v1/backup/exports/export_123/download",
-                expires_at=datetime.utcnow() + timedelta(hours=24),
-                metadata=None,
-                started_at=datetime.utcnow(),
-                completed_at=datetime.utcnow(),
-                duration_seconds=2.5,
-                error_message=None,
-                created_at=datetime.utcnow()
-            )
-            mock_get_service.return_value = mock_service
-            
-            export_request = {
-                "export_type": "full_backup",
-                "format": "json",
-                "compress_output": False,
-                "anonymize_data": False
-            }
-            
-            response = await async_client.post("/api/v1/backup/export", json=export_request)
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["id"] == "export_123"
-            assert data["export_type"] == "full_backup"
-            assert data["format"] == "json"
+        export_request = {
+            "export_type": "full_backup",
+            "format": "json",
+            "compress_output": False,
+            "anonymize_data": False
+        }
+        
+        response = client.post("/api/v1/backup/export", json=export_request)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["id"] == "export_123"
+        assert data["export_type"] == "full_backup"
+        assert data["format"] == "json"
 
 
 @pytest.mark.integration
 class TestFinancialEndpoints:
     """Integration tests for financial endpoints."""
     
-    def test_financial_endpoints_require_auth(self, client):
-        """Test financial endpoints require authentication."""
-        endpoints = [
-            ("GET", "/api/v1/accounts"),
-            ("POST", "/api/v1/accounts"),
-            ("GET", "/api/v1/categories"),
-            ("POST", "/api/v1/categories"),
-            ("GET", "/api/v1/transactions"),
-            ("POST", "/api/v1/transactions"),
-            ("GET", "/api/v1/budgets"),
-            ("POST", "/api/v1/budgets")
-        ]
-        
-        for method, endpoint in endpoints:
-            if method == "GET":
-                response = client.get(endpoint)
-            else:
-                response = client.post(endpoint, json={})
-            
-            assert response.status_code == 401
-    
-    @pytest.mark.asyncio
-    async def test_accounts_list_with_auth(self, async_client, mock_auth_middleware):
+    def test_accounts_list_with_auth(self, client, mock_auth_middleware, fake_services):
         """Test accounts list endpoint with authentication."""
-        with patch('src.services.account.get_account_service') as mock_get_service:
-            mock_service = AsyncMock()
-            mock_service.list_accounts.return_value = [
-                MagicMock(
-                    id="acc_1",
-                    account_name="Test Account",
-                    account_type="checking",
-                    balance=10000,
-                    is_active=True
-                )
-            ]
-            mock_get_service.return_value = mock_service
-            
-            response = await async_client.get("/api/v1/accounts")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert len(data) == 1
-            assert data[0]["id"] == "acc_1"
-            assert data[0]["account_name"] == "Test Account"
+        response = client.get("/api/v1/accounts")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["id"] == "acc_1"
+        assert data[0]["name"] == "Test Account"
     
-    @pytest.mark.asyncio
-    async def test_transactions_list_with_auth(self, async_client, mock_auth_middleware):
+    def test_transactions_list_with_auth(self, client, mock_auth_middleware, fake_services):
         """Test transactions list endpoint with authentication."""
-        with patch('src.services.transaction.get_transaction_service') as mock_get_service:
-            mock_service = AsyncMock()
-            mock_service.list_transactions.return_value = [
-                MagicMock(
-                    id="txn_1",
-                    transaction_type=TransactionType.EXPENSE,
-                    amount=2500,
-                    description="Test Transaction",
-                    transaction_date="2024-01-15",
-                    category_id="cat_1",
-                    account_id="acc_1"
-                )
-            ]
-            mock_get_service.return_value = mock_service
-            
-            response = await async_client.get("/api/v1/transactions")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert len(data) == 1
-            assert data[0]["id"] == "txn_1"
-            assert data[0]["amount"] == 2500
-            assert data[0]["description"] == "Test Transaction"
+        response = client.get("/api/v1/transactions")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert len(data) == 1
+        assert data[0]["id"] == "txn_1"
+        assert Decimal(data[0]["amount"]) == 2500
+        assert data[0]["description"] == "Test Transaction"
 
 
 @pytest.mark.integration
 class TestAsanaEndpoints:
     """Integration tests for Asana integration endpoints."""
     
-    def test_asana_endpoints_require_auth(self, client):
-        """Test Asana endpoints require authentication."""
-        endpoints = [
-            "/api/v1/asana/workspaces",
-            "/api/v1/asana/projects",
-            "/api/v1/asana/tasks",
-            "/api/v1/asana/oauth/status"
-        ]
-        
-        for endpoint in endpoints:
-            response = client.get(endpoint)
-            assert response.status_code == 401
-    
-    @pytest.mark.asyncio
-    async def test_asana_oauth_status_with_auth(self, async_client, mock_auth_middleware):
-        """Test Asana OAuth status endpoint."""
-        with patch('src.services.asana_integration.get_asana_integration_service') as mock_get_service:
-            mock_service = AsyncMock()
-            mock_service.get_oauth_status.return_value = {
-                "is_connected": False,
-                "workspace_id": None,
-                "workspace_name": None,
-                "last_sync": None
-            }
-            mock_get_service.return_value = mock_service
-            
-            response = await async_client.get("/api/v1/asana/oauth/status")
-            assert response.status_code == 200
-            
-            data = response.json()
-            assert data["is_connected"] is False
-            assert data["workspace_id"] is None
+    def test_asana_integration_status_with_auth(self, client, mock_auth_middleware, fake_services):
+        """Test Asana integration status endpoint for a user without an integration."""
+        response = client.get("/api/v1/asana/integration")
+        assert response.status_code == 200
+        assert response.json() is None
 
 
 @pytest.mark.integration
 class TestAdminEndpoints:
     """Integration tests for admin endpoints."""
     
-    def test_admin_endpoints_require_admin_auth(self, client):
-        """Test admin endpoints require admin authentication."""
-        admin_endpoints = [
-            "/api/v1/monitoring/system/status",
-            "/api/v1/monitoring/system/performance",
-            "/api/v1/monitoring/system/users",
-            "/api/v1/monitoring/system/database/stats"
-        ]
-        
-        for endpoint in admin_endpoints:
-            response = client.get(endpoint)
-            assert response.status_code == 401  # No auth
-    
-    @pytest.mark.asyncio
-    async def test_system_status_with_admin_auth(self, async_client, mock_admin_auth_middleware):
+    def test_system_status_with_admin_auth(
+        self, client, monkeypatch, mock_admin_auth_middleware, mock_health_checker, mock_rate_limiter
+    ):
         """Test system status endpoint with admin authentication."""
-        with patch('src.middleware.monitoring.get_health_checker') as mock_get_checker:
-            with patch('src.middleware.monitoring.get_rate_limiter') as mock_get_limiter:
-                # Mock health checker
-                mock_checker_instance = AsyncMock()
-                mock_checker_instance.get_comprehensive_health.return_value = {
-                    "overall_status": "healthy",
-                    "firestore": {"status": "healthy"},
-                    "external_apis": {"asana": {"status": "healthy"}}
-                }
-                mock_get_checker.return_value = mock_checker_instance
-                
-                # Mock rate limiter
-                mock_limiter_instance = AsyncMock()
-                mock_limiter_instance.get_rate_limit_status.return_value = {
-                    "active_sliding_windows": 5,
-                    "active_token_buckets": 3
-                }
-                mock_get_limiter.return_value = mock_limiter_instance
-                
-                response = await async_client.get("/api/v1/monitoring/system/status")
-                assert response.status_code == 200
-                
-                data = response.json()
-                assert "timestamp" in data
-                assert "health" in data
-                assert data["health"]["overall_status"] == "healthy"
+        # The database probe would otherwise wait on a real Firestore (or emulator)
+        firestore = AsyncMock()
+        firestore.get_document.return_value = None
+        monkeypatch.setattr("src.routers.monitoring.get_firestore", lambda: firestore)
+        
+        response = client.get("/api/v1/monitoring/system/status")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert "timestamp" in data
+        assert "health" in data
+        assert data["health"]["overall_status"] == "healthy"
+        assert data["database"]["status"] == "connected"
 
 
 @pytest.mark.integration
 class TestErrorHandling:
     """Integration tests for error handling."""
     
-    @pytest.mark.asyncio
-    async def test_404_error_handling(self, async_client):
+    def test_404_error_handling(self, client):
         """Test 404 error handling."""
-        response = await async_client.get("/api/v1/nonexistent-endpoint")
+        response = client.get("/api/v1/nonexistent-endpoint")
         assert response.status_code == 404
         
         data = response.json()
         assert "detail" in data
     
-    @pytest.mark.asyncio
-    async def test_method_not_allowed_handling(self, async_client):
+    def test_method_not_allowed_handling(self, client):
         """Test 405 method not allowed handling."""
         # Try to DELETE on an endpoint that only accepts GET
-        response = await async_client.delete("/api/v1/health")
+        response = client.delete("/api/v1/health")
         assert response.status_code == 405
     
     def test_request_validation_error(self, client):
@@ -435,9 +374,11 @@ class TestRateLimiting:
             # Just verify the endpoint works
             assert True
     
-    @pytest.mark.slow
     def test_rate_limiting_enforcement(self, client):
-        """Test rate limiting enforcement (if enabled)."""
+        """Test rate limiting enforcement (if enabled).
+        
+        The health endpoint bypasses the limiter, so no clock is involved.
+        """
         # Make multiple rapid requests
         responses = []
         for _ in range(10):
@@ -453,7 +394,7 @@ class TestRateLimiting:
 class TestMonitoringIntegration:
     """Integration tests for monitoring features."""
     
-    def test_request_metrics_collection(self, client):
+    def test_request_metrics_collection(self, client, metrics_response):
         """Test that request metrics are collected."""
         # Make a few requests
         for _ in range(3):
@@ -467,10 +408,9 @@ class TestMonitoringIntegration:
                 assert True  # Response time header present
         
         # Check that metrics endpoint shows activity
-        response = client.get("/api/v1/monitoring/metrics")
-        assert response.status_code == 200
+        assert metrics_response.status_code == 200
         
-        metrics = response.text
+        metrics = metrics_response.text
         # Should contain request metrics
         assert "financial_nomad_requests_total" in metrics
 
@@ -482,15 +422,17 @@ class TestPerformance:
     
     @pytest.mark.asyncio
     async def test_concurrent_requests_performance(self, async_client):
-        """Test handling of concurrent requests."""
+        """Test handling of concurrent requests on the shared session client."""
         import asyncio
         
+        get = async_client.get
+        
         async def make_request():
-            response = await async_client.get("/api/v1/health")
+            response = await get("/api/v1/health")
             return response.status_code
         
-        # Make 20 concurrent requests
-        tasks = [make_request() for _ in range(20)]
+        # Make 200 concurrent requests, enough to overlap on the pooled client
+        tasks = [make_request() for _ in range(200)]
         results = await asyncio.gather(*tasks)
         
         # All should succeed
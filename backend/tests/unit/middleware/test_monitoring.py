@@ -14,16 +14,18 @@ from src.middleware.monitoring import (
     HealthChecker,
     get_metrics_collector,
     get_health_checker,
-    get_prometheus_metrics
+    get_prometheus_metrics,
+    cleanup_health_http_client,
+    _get_http_client
 )
 
 
 class TestMetricsCollector:
     """Test cases for MetricsCollector."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def metrics_collector(self):
-        """Create metrics collector for testing."""
+        """Create metrics collector for testing, shared by the module."""
         with patch('src.middleware.monitoring.get_settings') as mock_settings:
             mock_settings.return_value = MagicMock()
             return MetricsCollector()
@@ -67,6 +69,20 @@ class TestMetricsCollector:
         metrics_collector.record_export_operation("csv", "transactions", "failed")
         assert True
     
+    @pytest.mark.unit
+    def test_record_reuses_labelled_children(self, metrics_collector):
+        """Test repeated records reuse the labelled child and still increment it."""
+        from src.middleware.monitoring import DATABASE_OPERATIONS
+        
+        child = DATABASE_OPERATIONS.labels("update", "budgets", "success")
+        before = child._value.get()
+        
+        metrics_collector.record_database_operation("update", "budgets", "success")
+        metrics_collector.record_database_operation("update", "budgets", "success")
+        
+        assert child._value.get() == before + 2
+        assert metrics_collector._database_children[("update", "budgets", "success")] is child
+    
     @pytest.mark.unit
     def test_update_active_sessions(self, metrics_collector):
         """Test updating active sessions gauge."""
@@ -79,18 +95,35 @@ class TestMetricsCollector:
 class TestHealthChecker:
     """Test cases for HealthChecker."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def health_checker(self):
-        """Create health checker for testing."""
+        """Create health checker for testing, shared by the module."""
         with patch('src.middleware.monitoring.get_settings') as mock_settings:
             mock_settings.return_value = MagicMock()
             return HealthChecker()
     
+    @pytest.fixture(autouse=True)
+    def fresh_health_state(self, health_checker, monkeypatch):
+        """Give each test its own settings, cached report and lock on the shared checker."""
+        monkeypatch.setattr(health_checker, 'settings', MagicMock())
+        monkeypatch.setattr(health_checker, '_cached_health', None)
+        monkeypatch.setattr(health_checker, '_health_lock', asyncio.Lock())
+        monkeypatch.setattr(
+            health_checker, '_probe_semaphore', asyncio.Semaphore(health_checker.MAX_CONCURRENT_PROBES)
+        )
+    
+    @pytest.fixture
+    def mock_http_client(self, monkeypatch):
+        """Stub the shared health probe HTTP client."""
+        client = AsyncMock()
+        monkeypatch.setattr('src.middleware.monitoring._get_http_client', lambda: client)
+        return client
+    
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_check_firestore_health_success(self, health_checker):
         """Test successful Firestore health check."""
-        with patch('src.middleware.monitoring.get_firestore') as mock_get_firestore:
+        with patch('src.infrastructure.get_firestore') as mock_get_firestore:
             mock_firestore = AsyncMock()
             mock_firestore.get_document = AsyncMock(return_value=None)  # Successful query
             mock_get_firestore.return_value = mock_firestore
@@ -100,13 +133,14 @@ class TestHealthChecker:
             assert result["status"] == "healthy"
             assert "response_time_ms" in result
             assert "timestamp" in result
+            assert isinstance(result["response_time_ms"], float)
             assert result["response_time_ms"] >= 0
     
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_check_firestore_health_failure(self, health_checker):
         """Test failed Firestore health check."""
-        with patch('src.middleware.monitoring.get_firestore') as mock_get_firestore:
+        with patch('src.infrastructure.get_firestore') as mock_get_firestore:
             mock_firestore = AsyncMock()
             mock_firestore.get_document = AsyncMock(side_effect=Exception("Connection failed"))
             mock_get_firestore.return_value = mock_firestore
@@ -117,76 +151,118 @@ class TestHealthChecker:
             assert "error" in result
             assert result["error"] == "Connection failed"
             assert "timestamp" in result
+            assert "response_time_ms" not in result
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_check_external_apis_health(self, health_checker):
+    async def test_check_external_apis_health(self, health_checker, monkeypatch):
         """Test external APIs health check."""
-        with patch('src.middleware.monitoring.get_settings') as mock_settings:
-            # Mock settings to enable Google Drive check
-            settings_mock = MagicMock()
-            settings_mock.google_client_id = "test-client-id"
-            mock_settings.return_value = settings_mock
-            health_checker.settings = settings_mock
-            
-            with patch.object(health_checker, '_check_google_api') as mock_google:
-                with patch.object(health_checker, '_check_asana_api') as mock_asana:
-                    mock_google.return_value = {"status": "healthy", "response_time_ms": 100}
-                    mock_asana.return_value = {"status": "healthy", "response_time_ms": 150}
-                    
-                    result = await health_checker.check_external_apis_health()
-                    
-                    assert "google_drive" in result
-                    assert "asana" in result
-                    assert result["google_drive"]["status"] == "healthy"
-                    assert result["asana"]["status"] == "healthy"
+        # Mock settings to enable Google Drive check
+        settings_mock = MagicMock()
+        settings_mock.google_client_id = "test-client-id"
+        monkeypatch.setattr(health_checker, 'settings', settings_mock)
+        
+        with patch.object(health_checker, '_check_google_api') as mock_google:
+            with patch.object(health_checker, '_check_asana_api') as mock_asana:
+                mock_google.return_value = {"status": "healthy", "response_time_ms": 100}
+                mock_asana.return_value = {"status": "healthy", "response_time_ms": 150}
+                
+                result = await health_checker.check_external_apis_health()
+                
+                assert "google_drive" in result
+                assert "asana" in result
+                assert result["google_drive"]["status"] == "healthy"
+                assert result["asana"]["status"] == "healthy"
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_check_external_apis_health_runs_probes_concurrently(self, health_checker):
+        """Test that the Google and Asana probes overlap instead of running in sequence."""
+        health_checker.settings.google_client_id = "test-client-id"
+        asana_started = asyncio.Event()
+        
+        async def google_probe():
+            # Only completes if the Asana probe starts while this one is pending
+            await asyncio.wait_for(asana_started.wait(), timeout=1.0)
+            return {"status": "healthy"}
+        
+        async def asana_probe():
+            asana_started.set()
+            return {"status": "healthy"}
+        
+        with patch.object(health_checker, '_check_google_api', google_probe):
+            with patch.object(health_checker, '_check_asana_api', asana_probe):
+                result = await health_checker.check_external_apis_health()
+        
+        assert result == {
+            "google_drive": {"status": "healthy"},
+            "asana": {"status": "healthy"}
+        }
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_external_api_probes_are_bounded(self, health_checker):
+        """Test no more than MAX_CONCURRENT_PROBES probes run at once across callers."""
+        health_checker.settings.google_client_id = "test-client-id"
+        in_flight = 0
+        high_water = 0
+        
+        async def probe():
+            nonlocal in_flight, high_water
+            in_flight += 1
+            high_water = max(high_water, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "healthy"}
+        
+        with patch.object(health_checker, '_check_google_api', probe):
+            with patch.object(health_checker, '_check_asana_api', probe):
+                results = await asyncio.gather(
+                    *(health_checker.check_external_apis_health() for _ in range(20))
+                )
+        
+        assert len(results) == 20
+        assert high_water == health_checker.MAX_CONCURRENT_PROBES
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_check_google_api_success(self, health_checker):
+    async def test_check_google_api_success(self, health_checker, mock_http_client):
         """Test successful Google API check."""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.elapsed.total_seconds.return_value = 0.1
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await health_checker._check_google_api()
-            
-            assert result["status"] == "healthy"
-            assert result["response_time_ms"] == 100
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.elapsed.total_seconds.return_value = 0.1
+        mock_http_client.get.return_value = mock_response
+        
+        result = await health_checker._check_google_api()
+        
+        assert result["status"] == "healthy"
+        assert result["response_time_ms"] == 100
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_check_google_api_failure(self, health_checker):
+    async def test_check_google_api_failure(self, health_checker, mock_http_client):
         """Test failed Google API check."""
-        with patch('httpx.AsyncClient') as mock_client:
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-                side_effect=Exception("Network error")
-            )
-            
-            result = await health_checker._check_google_api()
-            
-            assert result["status"] == "unhealthy"
-            assert "error" in result
+        mock_http_client.get.side_effect = Exception("Network error")
+        
+        result = await health_checker._check_google_api()
+        
+        assert result["status"] == "unhealthy"
+        assert "error" in result
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_check_asana_api_success(self, health_checker):
+    async def test_check_asana_api_success(self, health_checker, mock_http_client):
         """Test successful Asana API check."""
-        with patch('httpx.AsyncClient') as mock_client:
-            # Asana returns 401 for unauthenticated requests, which we consider healthy
-            mock_response = MagicMock()
-            mock_response.status_code = 401
-            mock_response.elapsed.total_seconds.return_value = 0.2
-            
-            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
-            
-            result = await health_checker._check_asana_api()
-            
-            assert result["status"] == "healthy"
-            assert result["response_time_ms"] == 200
+        # Asana returns 401 for unauthenticated requests, which we consider healthy
+        mock_response = MagicMock()
+        mock_response.status_code = 401
+        mock_response.elapsed.total_seconds.return_value = 0.2
+        mock_http_client.get.return_value = mock_response
+        
+        result = await health_checker._check_asana_api()
+        
+        assert result["status"] == "healthy"
+        assert result["response_time_ms"] == 200
     
     @pytest.mark.unit
     @pytest.mark.asyncio
@@ -236,6 +312,40 @@ class TestHealthChecker:
                 result = await health_checker.get_comprehensive_health()
                 
                 assert result["overall_status"] == "unhealthy"
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_comprehensive_health_cached_within_ttl(self, health_checker):
+        """Test concurrent and repeated calls within the TTL share one probe."""
+        with patch.object(health_checker, 'check_firestore_health') as mock_firestore:
+            with patch.object(health_checker, 'check_external_apis_health') as mock_apis:
+                mock_firestore.return_value = {"status": "healthy"}
+                mock_apis.return_value = {"asana": {"status": "healthy"}}
+                
+                results = await asyncio.gather(
+                    *(health_checker.get_comprehensive_health() for _ in range(10))
+                )
+                results[0]["overall_status"] = "mutated"
+                again = await health_checker.get_comprehensive_health()
+                
+                assert mock_firestore.call_count == 1
+                assert mock_apis.call_count == 1
+                assert again["overall_status"] == "healthy"
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_comprehensive_health_reprobes_after_ttl(self, health_checker):
+        """Test an expired cached report triggers a fresh probe."""
+        with patch.object(health_checker, 'check_firestore_health') as mock_firestore:
+            with patch.object(health_checker, 'check_external_apis_health') as mock_apis:
+                mock_firestore.return_value = {"status": "healthy"}
+                mock_apis.return_value = {"asana": {"status": "healthy"}}
+                
+                await health_checker.get_comprehensive_health()
+                health_checker._cached_at -= health_checker.CACHE_TTL_SECONDS
+                await health_checker.get_comprehensive_health()
+                
+                assert mock_firestore.call_count == 2
 
 
 class TestMonitoringMiddleware:
@@ -294,6 +404,31 @@ class TestMonitoringMiddleware:
         assert "X-Request-ID" in response.headers
         assert "X-Response-Time" in response.headers
     
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_request_ids_are_unique_per_process(self):
+        """Test request IDs share the process nonce and never repeat."""
+        from src.middleware.monitoring import _PROCESS_NONCE
+        
+        middleware = MonitoringMiddleware(MagicMock())
+        
+        async def call_next(_):
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {}
+            return response
+        
+        request_ids = []
+        with patch.object(middleware, '_track_business_metrics', AsyncMock()):
+            for _ in range(3):
+                request = MagicMock()
+                request.url.path = "/test"
+                response = await middleware.dispatch(request, call_next)
+                request_ids.append(response.headers["X-Request-ID"])
+        
+        assert len(set(request_ids)) == 3
+        assert all(request_id.startswith(f"{_PROCESS_NONCE}-") for request_id in request_ids)
+    
     @pytest.mark.unit
     def test_endpoint_pattern_extraction(self):
         """Test endpoint pattern extraction for metrics."""
@@ -301,11 +436,17 @@ class TestMonitoringMiddleware:
         
         middleware = MonitoringMiddleware(MagicMock())
         
+        def make_request(path):
+            return Request({"type": "http", "path": path, "headers": []})
+        
         # Test various patterns
-        assert middleware._extract_endpoint_pattern("/api/v1/transactions/123") == "/api/v1/transactions/{id}"
-        assert middleware._extract_endpoint_pattern("/api/v1/accounts/abc-def") == "/api/v1/accounts/{id}"
-        assert middleware._extract_endpoint_pattern("/api/v1/categories/456") == "/api/v1/categories/{id}"
-        assert middleware._extract_endpoint_pattern("/api/v1/health") == "/api/v1/health"  # No pattern match
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/transactions/123")) == "/api/v1/transactions/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/accounts/abc-def")) == "/api/v1/accounts/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/categories/456")) == "/api/v1/categories/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/budgets/789")) == "/api/v1/budgets/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/backup/exports/export_123")) == "/api/v1/backup/exports/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/asana/tasks/task_123")) == "/api/v1/asana/tasks/{id}"
+        assert middleware._extract_endpoint_pattern(make_request("/api/v1/health")) == "/api/v1/health"  # No pattern match
     
     @pytest.mark.unit
     def test_client_ip_extraction(self):
@@ -314,31 +455,40 @@ class TestMonitoringMiddleware:
         
         middleware = MonitoringMiddleware(MagicMock())
         
-        # Mock request with forwarded headers
-        request = MagicMock()
-        request.headers.get.side_effect = lambda header: {
-            'x-forwarded-for': '192.168.1.1, 10.0.0.1',
-            'x-real-ip': '192.168.1.1'
-        }.get(header)
-        request.client.host = '127.0.0.1'
+        def make_request(headers):
+            return Request({
+                "type": "http",
+                "headers": [(name.encode(), value.encode()) for name, value in headers],
+                "client": ("127.0.0.1", 50000)
+            })
         
         # Should extract from x-forwarded-for first
+        request = make_request([
+            ("x-forwarded-for", "192.168.1.1, 10.0.0.1"),
+            ("x-real-ip", "192.168.1.1")
+        ])
         ip = middleware._get_client_ip(request)
         assert ip == '192.168.1.1'
         
         # Test with x-real-ip only
-        request.headers.get.side_effect = lambda header: {
-            'x-real-ip': '192.168.1.2'
-        }.get(header) if header != 'x-forwarded-for' else None
-        
+        request = make_request([("x-real-ip", "192.168.1.2")])
         ip = middleware._get_client_ip(request)
         assert ip == '192.168.1.2'
         
         # Test with direct connection
-        request.headers.get.return_value = None
+        request = make_request([])
         ip = middleware._get_client_ip(request)
         assert ip == '127.0.0.1'
     
+    @pytest.mark.unit
+    def test_client_ip_extraction_without_client(self):
+        """Test client IP falls back to 'unknown' when the scope has no client."""
+        middleware = MonitoringMiddleware(MagicMock())
+        
+        request = Request({"type": "http", "headers": [], "client": None})
+        
+        assert middleware._get_client_ip(request) == 'unknown'
+    
     @pytest.mark.unit
     def test_active_requests_tracking(self):
         """Test active requests tracking."""
@@ -368,6 +518,34 @@ class TestMonitoringMiddleware:
         info = middleware.get_active_requests_info()
         assert info["count"] == 2
         assert len(info["requests"]) == 2
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("track", [True, False])
+    async def test_dispatch_records_active_requests_only_when_enabled(self, track):
+        """Test per-request details are kept in flight only when tracking is enabled."""
+        settings = MagicMock()
+        settings.monitor_track_active_requests = track
+        middleware = MonitoringMiddleware(MagicMock(), settings=settings)
+        
+        request = MagicMock()
+        request.method = "GET"
+        request.url.path = "/api/v1/health"
+        request.headers.get.return_value = None
+        seen = []
+        
+        async def call_next(_):
+            seen.append(middleware.get_active_requests_info()["count"])
+            response = MagicMock()
+            response.status_code = 200
+            response.headers = {}
+            return response
+        
+        with patch.object(middleware, '_track_business_metrics', AsyncMock()):
+            await middleware.dispatch(request, call_next)
+        
+        assert seen == [1 if track else 0]
+        assert middleware.active_requests == {}
 
 
 class TestPrometheusMetrics:
@@ -387,6 +565,54 @@ class TestPrometheusMetrics:
         assert "financial_nomad_requests_total" in metrics_output
         assert "financial_nomad_request_duration_seconds" in metrics_output
         assert "financial_nomad_active_requests" in metrics_output
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_get_prometheus_metrics_reuses_recent_output(self):
+        """Test scrapes within the TTL reuse the generated text."""
+        with patch('src.middleware.monitoring.generate_latest', return_value=b"# HELP x\n") as mock_generate:
+            first = await get_prometheus_metrics(max_age=0)
+            second = await get_prometheus_metrics(max_age=60)
+            third = await get_prometheus_metrics(max_age=0)
+        
+        assert first == second == third == "# HELP x\n"
+        assert mock_generate.call_count == 2
+    
+    @pytest.mark.integration
+    @pytest.mark.slow
+    def test_prometheus_metrics_aggregate_across_worker_processes(self, tmp_path):
+        """Test counters from separate worker processes add up in one scrape."""
+        import os
+        import subprocess
+        import sys
+        from pathlib import Path
+        
+        backend_root = Path(__file__).resolve().parents[3]
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        
+        def run(code):
+            return subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=backend_root, env=env, check=True, capture_output=True, text=True
+            ).stdout
+        
+        for _ in range(2):
+            run(
+                "from src.middleware.monitoring import metrics_collector; "
+                "metrics_collector.record_database_operation('create', 'multiproc_test', 'success')"
+            )
+        output = run(
+            "import asyncio; from src.middleware.monitoring import get_prometheus_metrics; "
+            "print(asyncio.run(get_prometheus_metrics()))"
+        )
+        
+        samples = [
+            line for line in output.splitlines()
+            if line.startswith("financial_nomad_database_operations_total{")
+            and 'collection="multiproc_test"' in line
+        ]
+        assert len(samples) == 1
+        assert samples[0].endswith(" 2.0")
 
 
 class TestGlobalInstances:
@@ -409,6 +635,21 @@ class TestGlobalInstances:
         
         assert checker1 is checker2
         assert isinstance(checker1, HealthChecker)
+    
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_health_http_client_is_shared_until_cleanup(self):
+        """Test health probes reuse one HTTP client until it is closed."""
+        client1 = _get_http_client()
+        client2 = _get_http_client()
+        
+        assert client1 is client2
+        
+        await cleanup_health_http_client()
+        
+        assert client1.is_closed
+        assert _get_http_client() is not client1
+        await cleanup_health_http_client()
 
 
 @pytest.mark.integration
@@ -435,8 +676,8 @@ class TestMonitoringIntegration:
             response = client.get(f"/test/item_{i}")
             assert response.status_code == 200
         
-        # Check that metrics were collected
-        metrics_output = await get_prometheus_metrics()
+        # Check that metrics were collected (bypassing the scrape cache)
+        metrics_output = await get_prometheus_metrics(max_age=0)
         
         # Should have request counts
         assert "financial_nomad_requests_total" in metrics_output
@@ -475,8 +716,11 @@ class TestMonitoringIntegration:
     
     @pytest.mark.integration
     @pytest.mark.slow
-    def test_monitoring_under_load(self):
+    @pytest.mark.asyncio
+    async def test_monitoring_under_load(self):
         """Test monitoring middleware under load."""
+        from httpx import ASGITransport, AsyncClient
+        
         app = FastAPI()
         app.add_middleware(MonitoringMiddleware)
         
@@ -484,17 +728,9 @@ class TestMonitoringIntegration:
         async def load_test_endpoint():
             return {"status": "ok"}
         
-        client = TestClient(app)
-        
-        # Make many concurrent requests
-        import concurrent.futures
-        
-        def make_request():
-            return client.get("/load-test")
-        
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            futures = [executor.submit(make_request) for _ in range(100)]
-            responses = [future.result() for future in futures]
+        # Fire all requests on one event loop so they overlap inside the middleware
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            responses = await asyncio.gather(*(client.get("/load-test") for _ in range(100)))
         
         # All requests should succeed
         assert all(r.status_code == 200 for r in responses)
@@ -502,4 +738,4 @@ class TestMonitoringIntegration:
         # All should have monitoring headers
         for response in responses[:10]:  # Sample check
             assert "X-Request-ID" in response.headers
-            assert "X-Response-Time" in response.headers
\ No newline at end of file
+            assert "X-Response-Time" in response.headers
@@ -0,0 +1,69 @@
+"""
+Tests for financial domain models.
+"""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+
+from src.models.financial import (
+    Transaction,
+    TransactionResponse,
+    TransactionSummary,
+    TransactionType
+)
+
+
+@pytest.fixture
+def transaction() -> Transaction:
+    """Validated transaction used as the source for DTO construction."""
+    return Transaction(
+        id="txn_001",
+        user_id="user_001",
+        amount=Decimal("42.50"),
+        description="Groceries",
+        transaction_type=TransactionType.EXPENSE,
+        transaction_date=datetime(2024, 1, 15, 12, 0, 0),
+        account_id="acc_001",
+        destination_account_id="acc_002",
+        category_id="cat_001",
+        reference="REF-1",
+        notes="Weekly shopping",
+        tags=["Food", " home "]
+    )
+
+
+@pytest.mark.unit
+class TestTransactionDTOs:
+    """Test transaction response/summary constructors."""
+
+    def test_response_from_transaction(self, transaction):
+        """Test response maps model fields onto the response schema."""
+        response = TransactionResponse.from_transaction(transaction)
+
+        assert response.id == "txn_001"
+        assert response.amount == Decimal("42.50")
+        assert response.transaction_type == TransactionType.EXPENSE
+        assert response.account_id == "acc_001"
+        assert response.to_account_id == "acc_002"
+        assert response.category_id == "cat_001"
+        assert response.subcategory_id is None
+        assert response.reference == "REF-1"
+        assert response.tags == ["food", "home"]
+        assert response.is_confirmed is True
+        assert response.is_reconciled is False
+        assert response.created_at == transaction.created_at
+        assert response.updated_at == transaction.updated_at
+        assert response.model_dump() == TransactionResponse.model_validate(response.model_dump()).model_dump()
+
+    def test_summary_from_transaction(self, transaction):
+        """Test summary carries the listing fields."""
+        summary = TransactionSummary.from_transaction(transaction)
+
+        assert summary.id == "txn_001"
+        assert summary.description == "Groceries"
+        assert summary.transaction_date == transaction.transaction_date
+        assert summary.destination_account_id == "acc_002"
+        assert summary.is_active is True
+        assert summary.account_name is None
+        assert summary.category_name is None
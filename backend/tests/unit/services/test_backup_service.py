@@ -2,67 +2,127 @@
 Unit tests for backup service.
 """
 import pytest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+from cryptography.fernet import Fernet
+
+from src.infrastructure.firestore import FirestoreService
 from src.services.backup import BackupService, get_backup_service
+from src.models.auth import User
 from src.models.backup import (
     BackupConfiguration,
+    BackupConfigurationResponse,
+    BackupMetadata,
+    BackupRecord,
     BackupType,
     BackupDestination,
     BackupStatus,
     BackupTriggerRequest
 )
+from src.models.financial import Account
 from src.utils.exceptions import NotFoundError, ValidationError as AppValidationError
 
+# Fernet keys must be 32 url-safe base64-encoded bytes
+_ENCRYPTION_KEY = Fernet.generate_key().decode()
+
+# Sample data built once at import; tests must not mutate these instances
+_SAMPLE_BACKUP_CONFIG = {
+    'auto_backup_enabled': True,
+    'backup_frequency': BackupType.SCHEDULED_WEEKLY,
+    'destinations': [BackupDestination.LOCAL_STORAGE],
+    'retention_days': 30,
+    'include_attachments': True,
+    'encryption_enabled': True
+}
+
+_SAMPLE_TRIGGER_REQUEST = BackupTriggerRequest(
+    backup_type=BackupType.MANUAL,
+    destinations=[BackupDestination.LOCAL_STORAGE],
+    include_attachments=True,
+    notify_on_completion=False
+)
+
+_CONFIG_RESPONSE = BackupConfigurationResponse(
+    id='config_123',
+    user_id='user_123',
+    **_SAMPLE_BACKUP_CONFIG,
+    notification_email=None,
+    google_drive_folder_id=None,
+    created_at=datetime(2024, 1, 1),
+    updated_at=datetime(2024, 1, 1)
+)
+
+# Firestore query results for _collect_user_data, in collection order
+_EMPTY: tuple = ()
+_ACCOUNTS = (
+    Account.model_construct(
+        id='acc_1',
+        user_id='user_123',
+        name='Test Account',
+        account_type='checking',
+        balance=10000
+    ),
+)
+
+
+@pytest.fixture(scope="module")
+def mock_firestore_module():
+    """Firestore mock shared by every test in the module."""
+    firestore = MagicMock(spec=FirestoreService)
+    firestore.create_document = AsyncMock()
+    firestore.get_document = AsyncMock()
+    firestore.update_document = AsyncMock()
+    firestore.delete_document = AsyncMock()
+    firestore.query_documents = AsyncMock()
+    return firestore
+
+
+@pytest.fixture
+def mock_firestore(mock_firestore_module):
+    """The shared Firestore mock, with calls and configured results cleared for each test."""
+    mock_firestore_module.reset_mock(return_value=True, side_effect=True)
+    return mock_firestore_module
+
+
+@pytest.fixture(scope="module")
+def backup_service(mock_firestore_module):
+    """Create backup service with mocked dependencies, once per module."""
+    with patch('src.services.backup.get_firestore', return_value=mock_firestore_module):
+        with patch('src.services.backup.get_settings') as mock_settings:
+            mock_settings.return_value.backup_encryption_key = _ENCRYPTION_KEY
+            return BackupService()
+
 
 class TestBackupService:
     """Test cases for BackupService."""
     
-    @pytest.fixture
-    def backup_service(self, mock_firestore):
-        """Create backup service with mocked dependencies."""
-        with patch('src.services.backup.get_firestore', return_value=mock_firestore):
-            with patch('src.services.backup.get_settings') as mock_settings:
-                mock_settings.return_value.backup_encryption_key = 'test-encryption-key-32-characters'
-                return BackupService()
-    
     @pytest.fixture
     def sample_backup_config(self):
         """Sample backup configuration."""
-        return {
-            'auto_backup_enabled': True,
-            'backup_frequency': BackupType.SCHEDULED_WEEKLY,
-            'destinations': [BackupDestination.LOCAL_STORAGE],
-            'retention_days': 30,
-            'include_attachments': True,
-            'encryption_enabled': True
-        }
+        # The service adds keys to the dict it is given when updating
+        return dict(_SAMPLE_BACKUP_CONFIG)
     
     @pytest.fixture
     def sample_trigger_request(self):
         """Sample backup trigger request."""
-        return BackupTriggerRequest(
-            backup_type=BackupType.MANUAL,
-            destinations=[BackupDestination.LOCAL_STORAGE],
-            include_attachments=True,
-            notify_on_completion=False
-        )
+        return _SAMPLE_TRIGGER_REQUEST
     
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_get_backup_configuration_exists(self, backup_service, mock_firestore, sample_backup_config):
         """Test getting existing backup configuration."""
         # Setup
+        now = datetime.utcnow()
         config_data = {
             'id': 'config_123',
             'user_id': 'user_123',
             **sample_backup_config,
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
-        mock_firestore.query_documents.return_value = [BackupConfiguration(**config_data)]
+        mock_firestore.query_documents.return_value = [BackupConfiguration.model_construct(**config_data)]
         
         # Execute
         result = await backup_service.get_backup_configuration('user_123')
@@ -94,7 +154,6 @@ class TestBackupService:
         """Test creating new backup configuration."""
         # Setup
         mock_firestore.query_documents.return_value = []  # No existing config
-        mock_firestore.create_document = AsyncMock()
         
         # Execute
         result = await backup_service.create_or_update_backup_configuration('user_123', sample_backup_config)
@@ -110,20 +169,18 @@ class TestBackupService:
     async def test_update_backup_configuration(self, backup_service, mock_firestore, sample_backup_config):
         """Test updating existing backup configuration."""
         # Setup - existing config
+        now = datetime.utcnow()
         existing_config_data = {
             'id': 'config_123',
             'user_id': 'user_123',
             **sample_backup_config,
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow()
+            'created_at': now,
+            'updated_at': now
         }
         
         # Mock the get_backup_configuration call
         with patch.object(backup_service, 'get_backup_configuration') as mock_get:
-            from src.models.backup import BackupConfigurationResponse
-            mock_get.return_value = BackupConfigurationResponse(**existing_config_data)
-            
-            mock_firestore.update_document = AsyncMock()
+            mock_get.return_value = BackupConfigurationResponse.model_construct(**existing_config_data)
             
             # Execute
             updated_config = {**sample_backup_config, 'retention_days': 60}
@@ -135,115 +192,74 @@ class TestBackupService:
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_trigger_backup_success(self, backup_service, mock_firestore, sample_trigger_request):
-        """Test successful backup trigger."""
-        # Setup
-        mock_firestore.create_document = AsyncMock()
-        mock_firestore.update_document = AsyncMock()
-        
-        # Mock backup configuration
-        with patch.object(backup_service, 'get_backup_configuration') as mock_get_config:
-            from src.models.backup import BackupConfigurationResponse
-            mock_get_config.return_value = BackupConfigurationResponse(
-                id='config_123',
-                user_id='user_123',
-                auto_backup_enabled=True,
-                backup_frequency=BackupType.SCHEDULED_WEEKLY,
-                destinations=[BackupDestination.LOCAL_STORAGE],
-                retention_days=30,
-                include_attachments=True,
-                encryption_enabled=True,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            
-            # Mock data collection
-            with patch.object(backup_service, '_collect_user_data') as mock_collect:
-                mock_collect.return_value = {'user_id': 'user_123', 'data': {}}
-                
-                # Mock metadata generation
-                with patch.object(backup_service, '_generate_backup_metadata') as mock_metadata:
-                    from src.models.backup import BackupMetadata
-                    mock_metadata.return_value = BackupMetadata(
-                        users_count=1,
-                        accounts_count=2,
-                        transactions_count=10,
-                        categories_count=5,
-                        budgets_count=3
-                    )
-                    
-                    # Mock backup storage
-                    with patch.object(backup_service, '_store_backup') as mock_store:
-                        mock_store.return_value = '/tmp/backup_test.gz'
-                        
-                        # Mock checksum
-                        with patch.object(backup_service, '_generate_file_checksum') as mock_checksum:
-                            mock_checksum.return_value = 'abc123def456'
-                            
-                            # Execute
-                            result = await backup_service.trigger_backup('user_123', sample_trigger_request)
-                            
-                            # Assert
-                            assert result is not None
-                            assert result.user_id == 'user_123'
-                            assert result.backup_type == BackupType.MANUAL
-                            assert result.status == BackupStatus.COMPLETED
-                            mock_firestore.create_document.assert_called_once()
-                            mock_firestore.update_document.assert_called_once()
-                            mock_collect.assert_called_once()
-                            mock_store.assert_called_once()
-    
-    @pytest.mark.unit
-    @pytest.mark.asyncio
-    async def test_trigger_backup_failure(self, backup_service, mock_firestore, sample_trigger_request):
-        """Test backup trigger failure handling."""
-        # Setup
-        mock_firestore.create_document = AsyncMock()
-        mock_firestore.update_document = AsyncMock()
-        
-        # Mock backup configuration
-        with patch.object(backup_service, 'get_backup_configuration') as mock_get_config:
-            from src.models.backup import BackupConfigurationResponse
-            mock_get_config.return_value = BackupConfigurationResponse(
-                id='config_123',
-                user_id='user_123',
-                auto_backup_enabled=True,
-                backup_frequency=BackupType.SCHEDULED_WEEKLY,
-                destinations=[BackupDestination.LOCAL_STORAGE],
-                retention_days=30,
-                include_attachments=True,
-                encryption_enabled=True,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            
-            # Mock data collection failure
-            with patch.object(backup_service, '_collect_user_data') as mock_collect:
-                mock_collect.side_effect = Exception("Data collection failed")
-                
+    @pytest.mark.parametrize("collect_behavior,expects_error", [
+        ({'user_id': 'user_123', 'data': {}}, False),
+        (Exception("Data collection failed"), True),
+    ], ids=["success", "collection_failure"])
+    async def test_trigger_backup(
+        self, backup_service, mock_firestore, sample_trigger_request, collect_behavior, expects_error
+    ):
+        """Test backup trigger completion and failure handling."""
+        # Mock configuration lookup, data collection, metadata, storage and checksum
+        if expects_error:
+            mock_collect = AsyncMock(side_effect=collect_behavior)
+        else:
+            mock_collect = AsyncMock(return_value=collect_behavior)
+        mock_store = AsyncMock(return_value='/tmp/backup_test.gz')
+        with patch.multiple(
+            backup_service,
+            get_backup_configuration=AsyncMock(return_value=_CONFIG_RESPONSE),
+            _collect_user_data=mock_collect,
+            _generate_backup_metadata=AsyncMock(return_value=BackupMetadata(
+                users_count=1,
+                accounts_count=2,
+                transactions_count=10,
+                categories_count=5,
+                budgets_count=3
+            )),
+            _store_backup=mock_store,
+            _generate_file_checksum=AsyncMock(return_value='abc123def456'),
+        ):
+            if expects_error:
                 # Execute & Assert
                 with pytest.raises(AppValidationError) as exc_info:
                     await backup_service.trigger_backup('user_123', sample_trigger_request)
                 
                 assert "Failed to complete backup" in str(exc_info.value.message)
-                mock_firestore.update_document.assert_called_once()  # Called for error update
+                mock_store.assert_not_called()
+            else:
+                # Execute
+                result = await backup_service.trigger_backup('user_123', sample_trigger_request)
+                
+                # Assert
+                assert result is not None
+                assert result.user_id == 'user_123'
+                assert result.backup_type == BackupType.MANUAL
+                assert result.status == BackupStatus.COMPLETED
+                mock_store.assert_called_once()
+            
+            mock_firestore.create_document.assert_called_once()
+            # Called with the final status, or for the error update
+            mock_firestore.update_document.assert_called_once()
+            mock_collect.assert_called_once()
     
     @pytest.mark.unit
     @pytest.mark.asyncio
     async def test_list_backups(self, backup_service, mock_firestore):
         """Test listing user backups."""
         # Setup
-        from src.models.backup import BackupRecord
+        now = datetime.utcnow()
+        expires = now + timedelta(days=30)
         backup_records = [
-            BackupRecord(
+            BackupRecord.model_construct(
                 id=f'backup_{i}',
                 user_id='user_123',
                 backup_type=BackupType.MANUAL,
                 destinations=[BackupDestination.LOCAL_STORAGE],
                 status=BackupStatus.COMPLETED,
-                started_at=datetime.utcnow(),
-                expires_at=datetime.utcnow() + timedelta(days=30),
-                created_at=datetime.utcnow()
+                started_at=now,
+                expires_at=expires,
+                created_at=now
             )
             for i in range(3)
         ]
@@ -262,20 +278,19 @@ class TestBackupService:
     async def test_delete_backup_success(self, backup_service, mock_firestore):
         """Test successful backup deletion."""
         # Setup
-        from src.models.backup import BackupRecord
-        backup_record = BackupRecord(
+        now = datetime.utcnow()
+        backup_record = BackupRecord.model_construct(
             id='backup_123',
             user_id='user_123',
             backup_type=BackupType.MANUAL,
             destinations=[BackupDestination.LOCAL_STORAGE],
             status=BackupStatus.COMPLETED,
             file_paths={BackupDestination.LOCAL_STORAGE.value: '/tmp/backup_test.gz'},
-            started_at=datetime.utcnow(),
-            expires_at=datetime.utcnow() + timedelta(days=30),
-            created_at=datetime.utcnow()
+            started_at=now,
+            expires_at=now + timedelta(days=30),
+            created_at=now
         )
         mock_firestore.get_document.return_value = backup_record
-        mock_firestore.delete_document = AsyncMock()
         
         # Mock file deletion
         with patch.object(backup_service, '_delete_backup_file') as mock_delete_file:
@@ -309,9 +324,6 @@ class TestBackupService:
     async def test_collect_user_data(self, backup_service, mock_firestore):
         """Test user data collection for backup."""
         # Setup mock data
-        from src.models.auth import User
-        from src.models.financial import Account, Category, Transaction, Budget, RecurringTransaction
-        
         user_data = User(
             id='user_123',
             email='test@example.com',
@@ -319,24 +331,9 @@ class TestBackupService:
             password_hash='hashed_password'
         )
         
-        accounts_data = [
-            Account(
-                id='acc_1',
-                user_id='user_123',
-                account_name='Test Account',
-                account_type='checking',
-                balance=10000
-            )
-        ]
-        
         mock_firestore.get_document.return_value = user_data
-        mock_firestore.query_documents.side_effect = [
-            accounts_data,  # accounts
-            [],  # categories
-            [],  # transactions
-            [],  # budgets
-            []   # recurring_transactions
-        ]
+        # accounts, categories, transactions, budgets, recurring_transactions
+        mock_firestore.query_documents.side_effect = (_ACCOUNTS, _EMPTY, _EMPTY, _EMPTY, _EMPTY)
         
         # Execute
         result = await backup_service._collect_user_data('user_123')
@@ -353,7 +350,8 @@ class TestBackupService:
         assert mock_firestore.query_documents.call_count == 5
     
     @pytest.mark.unit
-    def test_generate_backup_metadata(self, backup_service):
+    @pytest.mark.asyncio
+    async def test_generate_backup_metadata(self, backup_service):
         """Test backup metadata generation."""
         # Setup
         backup_data = {
@@ -371,7 +369,7 @@ class TestBackupService:
         }
         
         # Execute
-        result = asyncio.run(backup_service._generate_backup_metadata(backup_data))
+        result = await backup_service._generate_backup_metadata(backup_data)
         
         # Assert
         assert result.users_count == 1
@@ -379,8 +377,8 @@ class TestBackupService:
         assert result.transactions_count == 3
         assert result.categories_count == 1
         assert result.budgets_count == 0
-        assert result.date_range_start == '2024-01-01'
-        assert result.date_range_end == '2024-02-01'
+        assert result.date_range_start == date(2024, 1, 1)
+        assert result.date_range_end == date(2024, 2, 1)
     
     @pytest.mark.unit
     def test_get_backup_service_singleton(self):
@@ -400,84 +398,67 @@ class TestBackupServiceIntegration:
     
     @pytest.mark.integration
     @pytest.mark.asyncio
-    async def test_full_backup_workflow(self, mock_firestore):
+    async def test_full_backup_workflow(self, backup_service, mock_firestore):
         """Test complete backup workflow."""
-        with patch('src.services.backup.get_firestore', return_value=mock_firestore):
-            with patch('src.services.backup.get_settings') as mock_settings:
-                mock_settings.return_value.backup_encryption_key = 'test-encryption-key-32-characters'
-                
-                backup_service = BackupService()
-                
-                # Step 1: Create configuration
-                config_data = {
-                    'auto_backup_enabled': True,
-                    'backup_frequency': BackupType.SCHEDULED_DAILY,
-                    'destinations': [BackupDestination.LOCAL_STORAGE],
-                    'retention_days': 7,
-                    'encryption_enabled': True
-                }
-                
-                mock_firestore.query_documents.return_value = []  # No existing config
-                mock_firestore.create_document = AsyncMock()
-                
-                config = await backup_service.create_or_update_backup_configuration('user_123', config_data)
-                assert config.auto_backup_enabled is True
-                
-                # Step 2: Trigger backup
-                trigger_request = BackupTriggerRequest(
-                    backup_type=BackupType.MANUAL,
-                    destinations=[BackupDestination.LOCAL_STORAGE],
-                    include_attachments=False
-                )
-                
-                # Mock all required methods for backup
-                with patch.object(backup_service, 'get_backup_configuration') as mock_get_config:
-                    mock_get_config.return_value = config
-                    
-                    with patch.object(backup_service, '_collect_user_data') as mock_collect:
-                        mock_collect.return_value = {'user_id': 'user_123', 'data': {'transactions': []}}
-                        
-                        with patch.object(backup_service, '_generate_backup_metadata') as mock_metadata:
-                            from src.models.backup import BackupMetadata
-                            mock_metadata.return_value = BackupMetadata(
-                                users_count=1,
-                                accounts_count=0,
-                                transactions_count=0,
-                                categories_count=0,
-                                budgets_count=0
-                            )
-                            
-                            with patch.object(backup_service, '_store_backup') as mock_store:
-                                mock_store.return_value = '/tmp/backup_user_123.gz'
-                                
-                                with patch.object(backup_service, '_generate_file_checksum') as mock_checksum:
-                                    mock_checksum.return_value = 'checksum123'
-                                    
-                                    mock_firestore.update_document = AsyncMock()
-                                    
-                                    # Execute backup
-                                    backup_result = await backup_service.trigger_backup('user_123', trigger_request)
-                                    
-                                    # Verify backup completed
-                                    assert backup_result.status == BackupStatus.COMPLETED
-                                    assert backup_result.user_id == 'user_123'
-                                    assert backup_result.backup_type == BackupType.MANUAL
-                
-                # Step 3: List backups
-                from src.models.backup import BackupRecord
-                mock_firestore.query_documents.return_value = [
-                    BackupRecord(
-                        id=backup_result.id,
-                        user_id='user_123',
-                        backup_type=BackupType.MANUAL,
-                        destinations=[BackupDestination.LOCAL_STORAGE],
-                        status=BackupStatus.COMPLETED,
-                        started_at=datetime.utcnow(),
-                        expires_at=datetime.utcnow() + timedelta(days=7),
-                        created_at=datetime.utcnow()
-                    )
-                ]
-                
-                backups = await backup_service.list_backups('user_123')
-                assert len(backups) == 1
-                assert backups[0].user_id == 'user_123'
\ No newline at end of file
+        # Step 1: Create configuration
+        config_data = {
+            'auto_backup_enabled': True,
+            'backup_frequency': BackupType.SCHEDULED_DAILY,
+            'destinations': [BackupDestination.LOCAL_STORAGE],
+            'retention_days': 7,
+            'encryption_enabled': True
+        }
+        
+        mock_firestore.query_documents.return_value = []  # No existing config
+        
+        config = await backup_service.create_or_update_backup_configuration('user_123', config_data)
+        assert config.auto_backup_enabled is True
+        
+        # Step 2: Trigger backup
+        trigger_request = BackupTriggerRequest(
+            backup_type=BackupType.MANUAL,
+            destinations=[BackupDestination.LOCAL_STORAGE],
+            include_attachments=False
+        )
+        
+        # Mock all required methods for backup
+        with patch.multiple(
+            backup_service,
+            get_backup_configuration=AsyncMock(return_value=config),
+            _collect_user_data=AsyncMock(return_value={'user_id': 'user_123', 'data': {'transactions': []}}),
+            _generate_backup_metadata=AsyncMock(return_value=BackupMetadata(
+                users_count=1,
+                accounts_count=0,
+                transactions_count=0,
+                categories_count=0,
+                budgets_count=0
+            )),
+            _store_backup=AsyncMock(return_value='/tmp/backup_user_123.gz'),
+            _generate_file_checksum=AsyncMock(return_value='checksum123'),
+        ):
+            # Execute backup
+            backup_result = await backup_service.trigger_backup('user_123', trigger_request)
+            
+            # Verify backup completed
+            assert backup_result.status == BackupStatus.COMPLETED
+            assert backup_result.user_id == 'user_123'
+            assert backup_result.backup_type == BackupType.MANUAL
+        
+        # Step 3: List backups
+        now = datetime.utcnow()
+        mock_firestore.query_documents.return_value = [
+            BackupRecord.model_construct(
+                id=backup_result.id,
+                user_id='user_123',
+                backup_type=BackupType.MANUAL,
+                destinations=[BackupDestination.LOCAL_STORAGE],
+                status=BackupStatus.COMPLETED,
+                started_at=now,
+                expires_at=now + timedelta(days=7),
+                created_at=now
+            )
+        ]
+        
+        backups = await backup_service.list_backups('user_123')
+        assert len(backups) == 1
+        assert backups[0].user_id == 'user_123'
\ No newline at end of file
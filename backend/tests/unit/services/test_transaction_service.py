@@ -0,0 +1,55 @@
+"""
+Unit tests for transaction service.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.models.financial import Account
+from src.services.transaction import TransactionService
+from src.utils.exceptions import NotFoundError
+
+
+class TestTransactionService:
+    """Test cases for TransactionService."""
+
+    @pytest.fixture
+    def firestore(self):
+        """Mocked Firestore service."""
+        firestore = MagicMock()
+        firestore.get_document = AsyncMock(return_value=MagicMock(spec=Account))
+        return firestore
+
+    @pytest.fixture
+    def transaction_service(self, firestore):
+        """Create transaction service with mocked dependencies."""
+        with patch('src.services.transaction.get_firestore', return_value=firestore):
+            with patch('src.services.transaction.get_settings'):
+                return TransactionService()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_delete_transaction_single_patch(self, transaction_service, firestore):
+        """Test soft delete is a single field update without a prior read."""
+        firestore.patch_document = AsyncMock()
+
+        await transaction_service.delete_transaction("user_123", "txn_123")
+
+        firestore.get_document.assert_not_awaited()
+        firestore.patch_document.assert_awaited_once()
+        kwargs = firestore.patch_document.await_args.kwargs
+        assert kwargs["collection"] == "transactions/user_123/user_transactions"
+        assert kwargs["document_id"] == "txn_123"
+        assert kwargs["updates"]["is_active"] is False
+        assert kwargs["updates"]["is_deleted"] is True
+        assert kwargs["updates"]["deleted_at"] == kwargs["updates"]["updated_at"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_delete_transaction_not_found(self, transaction_service, firestore):
+        """Test deleting a missing transaction raises NotFoundError."""
+        firestore.patch_document = AsyncMock(side_effect=NotFoundError(message="Document txn_123 not found"))
+
+        with pytest.raises(NotFoundError) as exc_info:
+            await transaction_service.delete_transaction("user_123", "txn_123")
+
+        assert exc_info.value.message == "Transaction with ID 'txn_123' not found"
@@ -0,0 +1,630 @@
+"""
+Unit tests for webhook service.
+"""
+import asyncio
+import json
+import pytest
+from dataclasses import fields
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+import xml.etree.ElementTree as ET
+
+from src.services.webhook_service import (
+    MAX_CONCURRENT_DELIVERIES_PER_HOST,
+    WebhookDelivery,
+    WebhookDeliveryEngine,
+    WebhookEndpoint,
+    WebhookEvent,
+    WebhookFilter,
+    WebhookFormat,
+    WebhookPayload,
+    WebhookRegistry,
+    WebhookRetryManager,
+    WebhookService,
+    WebhookSigner,
+    WebhookStatus,
+    _json_payload,
+    _json_payload_prefix,
+    _flatten_dict,
+    _to_form_data,
+    _to_json,
+    _to_xml
+)
+
+
+def make_endpoint(**overrides) -> WebhookEndpoint:
+    """Build a webhook endpoint for tests."""
+    values = {
+        "id": "wh_123",
+        "user_id": "user_123",
+        "name": "Test endpoint",
+        "url": "https://hooks.example.com/webhook",
+        "events": [WebhookEvent.TRANSACTION_CREATED],
+        "secret": "whs_test_secret"
+    }
+    values.update(overrides)
+    return WebhookEndpoint(**values)
+
+
+def make_delivery(**overrides) -> WebhookDelivery:
+    """Build a webhook delivery for tests."""
+    values = {
+        "id": "del_123",
+        "endpoint_id": "wh_123",
+        "event_type": WebhookEvent.TRANSACTION_CREATED,
+        "payload": {"amount": Decimal("10.50"), "date": datetime(2024, 1, 15, 12, 0, 0)}
+    }
+    values.update(overrides)
+    return WebhookDelivery(**values)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("instance", [
+    make_endpoint(),
+    make_delivery(),
+    WebhookPayload(event="e", timestamp="t", data={}, user_id="u", webhook_id="w"),
+])
+def test_webhook_records_use_slots(instance):
+    """Test webhook dataclasses reject undeclared attributes."""
+    assert not hasattr(instance, "__dict__")
+    with pytest.raises(AttributeError):
+        instance.undeclared = True
+
+
+class TestWebhookSigner:
+    """Test cases for WebhookSigner."""
+
+    @pytest.mark.unit
+    def test_sign_for_endpoint_matches_generate_signature(self):
+        """Test the primed per-endpoint HMAC produces the standard signature."""
+        endpoint = make_endpoint()
+        payload = b'{"event":"transaction.created"}'
+
+        first = WebhookSigner.sign_for_endpoint(payload, endpoint)
+        second = WebhookSigner.sign_for_endpoint(payload, endpoint)
+
+        assert first == second == WebhookSigner.generate_signature(payload, endpoint.secret)
+        assert WebhookSigner.sign_for_endpoint(b"other", endpoint) == WebhookSigner.generate_signature(
+            b"other", endpoint.secret
+        )
+
+    @pytest.mark.unit
+    def test_verify_signature(self):
+        """Test signatures verify for str and bytes payloads and reject tampering."""
+        payload = '{"event":"transaction.created"}'
+        signature = WebhookSigner.generate_signature(payload, "secret")
+
+        assert WebhookSigner.verify_signature(payload, signature, "secret")
+        assert WebhookSigner.verify_signature(payload.encode(), signature, "secret")
+        assert WebhookSigner.verify_signature(
+            payload, WebhookSigner.generate_signature(payload, "secret", "sha1"), "secret"
+        )
+        assert not WebhookSigner.verify_signature(payload + " ", signature, "secret")
+        assert not WebhookSigner.verify_signature(payload, signature, "other-secret")
+        assert not WebhookSigner.verify_signature(payload, signature.replace("=", ""), "secret")
+        assert not WebhookSigner.verify_signature(
+            payload, WebhookSigner.generate_signature(payload, "secret", "md5"), "secret"
+        )
+        assert not WebhookSigner.verify_signature(payload, "sha256=café", "secret")
+
+
+class TestWebhookFilter:
+    """Test cases for WebhookFilter."""
+
+    @pytest.mark.unit
+    def test_should_deliver_matches_nested_conditions(self):
+        """Test nested dot-path conditions are matched against event data."""
+        endpoint = make_endpoint(filter_conditions={"account.type": "checking", "currency": "EUR"})
+        webhook_filter = WebhookFilter()
+
+        assert webhook_filter.should_deliver(endpoint, {"account": {"type": "checking"}, "currency": "EUR"})
+        assert not webhook_filter.should_deliver(endpoint, {"account": {"type": "savings"}, "currency": "EUR"})
+        assert not webhook_filter.should_deliver(endpoint, {"account": "checking", "currency": "EUR"})
+        assert not webhook_filter.should_deliver(endpoint, {"currency": "EUR"})
+
+    @pytest.mark.unit
+    def test_compile_refreshes_conditions(self):
+        """Test recompiling picks up changed filter conditions."""
+        endpoint = make_endpoint(filter_conditions={"currency": "EUR"})
+        webhook_filter = WebhookFilter()
+        assert webhook_filter.should_deliver(endpoint, {"currency": "EUR"})
+
+        endpoint.filter_conditions = {"currency": "USD"}
+        WebhookFilter.compile(endpoint)
+
+        assert not webhook_filter.should_deliver(endpoint, {"currency": "EUR"})
+        assert webhook_filter.should_deliver(endpoint, {"currency": "USD"})
+
+
+class TestWebhookRegistry:
+    """Test cases for WebhookRegistry."""
+
+    @pytest.mark.unit
+    def test_get_endpoints_for_event_uses_index(self):
+        """Test event lookup follows register, update and unregister."""
+        registry = WebhookRegistry()
+        endpoint = make_endpoint()
+        other_user = make_endpoint(id="wh_456", user_id="user_456")
+        registry.register_endpoint(endpoint)
+        registry.register_endpoint(other_user)
+
+        assert registry.get_endpoints_for_event(WebhookEvent.TRANSACTION_CREATED, "user_123") == [endpoint]
+        assert registry.get_endpoints_for_event(WebhookEvent.BUDGET_EXCEEDED, "user_123") == []
+
+        registry.update_endpoint_events(endpoint, [WebhookEvent.BUDGET_EXCEEDED])
+        assert registry.get_endpoints_for_event(WebhookEvent.TRANSACTION_CREATED, "user_123") == []
+        assert registry.get_endpoints_for_event(WebhookEvent.BUDGET_EXCEEDED, "user_123") == [endpoint]
+
+        endpoint.is_active = False
+        assert registry.get_endpoints_for_event(WebhookEvent.BUDGET_EXCEEDED, "user_123") == []
+
+        registry.unregister_endpoint(endpoint.id)
+        assert registry.get_endpoints_for_event(WebhookEvent.BUDGET_EXCEEDED, "user_123") == []
+        assert registry.get_endpoints_for_event(WebhookEvent.TRANSACTION_CREATED, "user_456") == [other_user]
+
+
+class TestWebhookRetryManager:
+    """Test cases for WebhookRetryManager."""
+
+    @pytest.mark.unit
+    def test_get_ready_retries_pops_due_deliveries_in_order(self):
+        """Test only due deliveries are returned, earliest first."""
+        retry_manager = WebhookRetryManager()
+        for delivery_id, interval in (("del_late", 3600), ("del_due", -30), ("del_overdue", -60)):
+            retry_manager.schedule_retry(
+                make_delivery(id=delivery_id, attempts=1),
+                make_endpoint(retry_interval_seconds=interval)
+            )
+
+        ready = retry_manager.get_ready_retries()
+
+        assert [d.id for d in ready] == ["del_overdue", "del_due"]
+        assert len(retry_manager) == 1
+
+    @pytest.mark.unit
+    def test_schedule_retry_stops_after_max_attempts(self):
+        """Test deliveries out of attempts are failed instead of queued."""
+        retry_manager = WebhookRetryManager()
+        delivery = make_delivery(attempts=3, max_attempts=3)
+
+        retry_manager.schedule_retry(delivery, make_endpoint())
+
+        assert delivery.status == WebhookStatus.FAILED
+        assert len(retry_manager) == 0
+
+    @pytest.mark.unit
+    def test_seconds_until_next_retry(self):
+        """Test the delay to the earliest retry is read from the heap head."""
+        retry_manager = WebhookRetryManager()
+        assert retry_manager.seconds_until_next_retry() is None
+
+        retry_manager.schedule_retry(make_delivery(attempts=1), make_endpoint(retry_interval_seconds=3600))
+        assert 3590 < retry_manager.seconds_until_next_retry() <= 3600
+
+        retry_manager.schedule_retry(make_delivery(attempts=1), make_endpoint(retry_interval_seconds=-60))
+        assert retry_manager.seconds_until_next_retry() == 0.0
+
+
+class TestWebhookDeliveryEngine:
+    """Test cases for WebhookDeliveryEngine."""
+
+    @pytest.fixture
+    def captured(self):
+        """Requests captured by the mock transport."""
+        return []
+
+    @pytest.fixture
+    def delivery_engine(self, captured):
+        """Create delivery engine backed by a mock transport."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            captured.append(request)
+            return httpx.Response(200, text="ok")
+
+        engine = WebhookDeliveryEngine()
+        engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return engine
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deliver_json_payload_signed(self, delivery_engine, captured):
+        """Test JSON deliveries are signed over the exact body sent."""
+        endpoint = make_endpoint()
+        delivery = make_delivery()
+
+        assert await delivery_engine.deliver_webhook(endpoint, delivery)
+
+        request = captured[0]
+        body = json.loads(request.content)
+        assert list(body) == [f.name for f in fields(WebhookPayload)]
+        assert body["event"] == "transaction.created"
+        assert body["webhook_id"] == endpoint.id
+        assert request.headers["X-Webhook-Timestamp"] == body["timestamp"]
+        assert body["data"] == {"amount": "10.50", "date": "2024-01-15 12:00:00"}
+        assert WebhookSigner.verify_signature(
+            request.content, request.headers["X-Webhook-Signature"], endpoint.secret
+        )
+        assert delivery.status == WebhookStatus.DELIVERED
+        assert delivery.response_body == "ok"
+        assert endpoint.successful_deliveries == 1
+        assert endpoint.last_used == delivery.delivered_at
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("webhook_format, content_type", [
+        (WebhookFormat.FORM_DATA, "application/x-www-form-urlencoded"),
+        (WebhookFormat.XML, "application/xml"),
+    ])
+    async def test_deliver_non_json_formats(self, delivery_engine, captured, webhook_format, content_type):
+        """Test form and XML endpoints get their serializer and content type."""
+        endpoint = make_endpoint(format=webhook_format)
+
+        assert await delivery_engine.deliver_webhook(endpoint, make_delivery())
+
+        request = captured[0]
+        assert request.headers["Content-Type"] == content_type
+        assert b"transaction.created" in request.content
+        assert WebhookSigner.verify_signature(
+            request.content, request.headers["X-Webhook-Signature"], endpoint.secret
+        )
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deliver_caps_response_body(self):
+        """Test only the start of a large error response is kept."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500, content=b"E" * 50_000)
+
+        engine = WebhookDeliveryEngine()
+        engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        endpoint = make_endpoint()
+        delivery = make_delivery()
+
+        assert not await engine.deliver_webhook(endpoint, delivery)
+
+        assert delivery.response_status == 500
+        assert delivery.response_body == "E" * 1000
+        assert delivery.error_message == "HTTP 500: " + "E" * 200
+        assert delivery.status == WebhookStatus.FAILED
+        assert endpoint.failed_deliveries == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_deliveries_capped_per_host(self):
+        """Test concurrent deliveries to one host are limited."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        engine = WebhookDeliveryEngine()
+        engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        endpoint = make_endpoint()
+
+        results = await asyncio.gather(*(
+            engine.deliver_webhook(endpoint, make_delivery(id=f"del_{i}")) for i in range(12)
+        ))
+
+        assert all(results)
+        assert max_in_flight == MAX_CONCURRENT_DELIVERIES_PER_HOST
+
+    @pytest.mark.unit
+    def test_shared_json_prefix_matches_full_serialization(self):
+        """Test splicing webhook_id onto a shared prefix equals serializing the whole payload."""
+        data = {"amount": Decimal("10.50"), "nested": {"when": datetime(2024, 1, 15)}, "tags": ["a"]}
+        prefix = _json_payload_prefix("transaction.created", "2024-01-15T00:00:00Z", data, "user_123")
+
+        assert _json_payload(prefix, 'wh_"123"') == _to_json({
+            "event": "transaction.created",
+            "timestamp": "2024-01-15T00:00:00Z",
+            "data": data,
+            "user_id": "user_123",
+            "webhook_id": 'wh_"123"',
+            "signature": None,
+            "version": "1.0"
+        })
+
+    @pytest.mark.unit
+    def test_flatten_dict_keeps_depth_first_order(self):
+        """Test nested keys are dotted and emitted in depth-first order."""
+        data = {"a": {"x": 1, "y": {"z": None}}, "b": 2, "c": {}, "d": [1, 2]}
+
+        assert list(_flatten_dict(data).items()) == [
+            ("a.x", "1"), ("a.y.z", "None"), ("b", "2"), ("d", "[1, 2]")
+        ]
+        assert _to_form_data(data) == b"a.x=1&a.y.z=None&b=2&d=%5B1%2C+2%5D"
+
+    @pytest.mark.unit
+    def test_to_xml_preserves_structure_and_escapes(self):
+        """Test XML output keeps element order, nests dicts and escapes text."""
+        data = {
+            "event": "transaction.created",
+            "data": {"description": "Fish & <Chips>", "tags": ["food", "pub"], "lines": [{"n": 1}, {"n": 2}]},
+            "user_id": "user_123"
+        }
+
+        xml_bytes = _to_xml(data)
+        root = ET.fromstring(xml_bytes)
+
+        assert xml_bytes.startswith(b"<?xml")
+        assert [child.tag for child in root] == ["event", "data", "user_id"]
+        assert root.findtext("data/description") == "Fish & <Chips>"
+        assert [tag.text for tag in root.findall("data/tags")] == ["food", "pub"]
+        assert [line.findtext("n") for line in root.findall("data/lines")] == ["1", "2"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_serialize_large_payload_offloaded(self, monkeypatch):
+        """Test large form payloads are serialized in a worker thread."""
+        engine = WebhookDeliveryEngine()
+        calls = []
+
+        async def fake_to_thread(func, *args):
+            calls.append(func)
+            return func(*args)
+
+        monkeypatch.setattr("src.services.webhook_service.asyncio.to_thread", fake_to_thread)
+
+        small = await engine._serialize(_to_form_data, {"a": {"b": 1}}, 14)
+        assert small == b"a.b=1"
+        assert calls == []
+
+        await engine._serialize(_to_form_data, {"blob": "x" * 70_000}, 70_011)
+        assert calls == [_to_form_data]
+
+
+class TestWebhookService:
+    """Test cases for WebhookService."""
+
+    @pytest.fixture
+    def sent(self):
+        """Requests captured by the mock transport."""
+        return []
+
+    @pytest.fixture
+    def webhook_service(self, sent):
+        """Create webhook service backed by a mock transport."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200)
+
+        service = WebhookService()
+        service.delivery_engine.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return service
+
+    async def _create_endpoints(self, service, count, **kwargs):
+        """Create endpoints subscribed to transaction.created for user_123."""
+        return [
+            await service.create_endpoint(
+                user_id="user_123",
+                name=f"Endpoint {i}",
+                url=f"https://hooks{i}.example.com/webhook",
+                events=[WebhookEvent.TRANSACTION_CREATED],
+                **kwargs
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_endpoint_generates_ids_and_secret(self, webhook_service):
+        """Test endpoint IDs and secrets are random and well-formed."""
+        first, second = await self._create_endpoints(webhook_service, 2)
+
+        assert first.id.startswith("wh_") and len(first.id) == 15
+        assert first.secret.startswith("whs_") and len(first.secret) == 47
+        assert first.id != second.id
+        assert first.secret != second.secret
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_create_endpoint_sends_no_requests(self, webhook_service, sent):
+        """Test registering an endpoint never contacts the user-supplied URL."""
+        await self._create_endpoints(webhook_service, 1)
+
+        assert sent == []
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_delivers_concurrently(self, webhook_service):
+        """Test deliveries to several endpoints overlap instead of running serially."""
+        await self._create_endpoints(webhook_service, 3)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def deliver(endpoint, delivery, json_prefix=None, filtered=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            delivery.attempts += 1
+            return True
+
+        webhook_service.delivery_engine.deliver_webhook = deliver
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"amount": 10}
+        )
+
+        assert len(delivery_ids) == 3
+        assert max_in_flight == 3
+        created = {webhook_service.registry.deliveries[d].created_at for d in delivery_ids}
+        assert len(created) == 1
+        assert len(webhook_service.retry_manager) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_skips_filtered_endpoints(self, webhook_service):
+        """Test endpoints whose filters reject the event get no delivery record."""
+        matching, filtered = await self._create_endpoints(webhook_service, 2)
+        await webhook_service.update_endpoint(filtered.id, filter_conditions={"currency": "USD"})
+        delivered_to = []
+
+        async def deliver(endpoint, delivery, json_prefix=None, filtered=False):
+            delivered_to.append(endpoint.id)
+            return True
+
+        webhook_service.delivery_engine.deliver_webhook = deliver
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"currency": "EUR"}
+        )
+
+        assert delivered_to == [matching.id]
+        assert len(delivery_ids) == 1
+        assert list(webhook_service.registry.deliveries) == delivery_ids
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_evaluates_filters_once(self, webhook_service, monkeypatch):
+        """Test each endpoint's filter runs once per published event."""
+        await self._create_endpoints(webhook_service, 2, filter_conditions={"currency": "EUR"})
+        webhook_filter = webhook_service.delivery_engine.filter
+        checked = []
+
+        def counting_should_deliver(endpoint, event_data):
+            checked.append(endpoint.id)
+            return WebhookFilter.should_deliver(webhook_filter, endpoint, event_data)
+
+        monkeypatch.setattr(webhook_filter, "should_deliver", counting_should_deliver)
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"currency": "EUR"}
+        )
+
+        assert len(delivery_ids) == 2
+        assert len(checked) == 2
+        for delivery_id in delivery_ids:
+            assert webhook_service.registry.deliveries[delivery_id].status == WebhookStatus.DELIVERED
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_serializes_json_once(self, webhook_service, monkeypatch):
+        """Test a fan-out to mixed formats serializes the event to JSON a single time."""
+        endpoints = await self._create_endpoints(webhook_service, 3)
+        for endpoint, webhook_format in zip(endpoints, WebhookFormat):
+            endpoint.format = webhook_format
+        json_calls = []
+
+        def counting_to_json(data):
+            json_calls.append(data)
+            return _to_json(data)
+
+        monkeypatch.setattr("src.services.webhook_service._to_json", counting_to_json)
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"amount": 10}
+        )
+
+        assert len(delivery_ids) == 3
+        for delivery_id in delivery_ids:
+            assert webhook_service.registry.deliveries[delivery_id].status == WebhookStatus.DELIVERED
+        assert len(json_calls) == 1
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_with_int_keys(self, webhook_service):
+        """Test payloads keyed by integers serialize and deliver."""
+        await self._create_endpoints(webhook_service, 1)
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"by_month": {1: 10}}
+        )
+
+        delivery = webhook_service.registry.deliveries[delivery_ids[0]]
+        assert delivery.status == WebhookStatus.DELIVERED
+        assert _to_json({"by_month": {1: 10}}) == b'{"by_month":{"1":10}}'
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_records_serialization_failure(self, webhook_service, monkeypatch):
+        """Test an unserializable payload fails its deliveries instead of the publish."""
+        await self._create_endpoints(webhook_service, 2)
+
+        def failing_to_json(data):
+            raise TypeError("Type is not JSON serializable")
+
+        monkeypatch.setattr("src.services.webhook_service._to_json", failing_to_json)
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"amount": 10}
+        )
+
+        assert len(delivery_ids) == 2
+        for delivery_id in delivery_ids:
+            delivery = webhook_service.registry.deliveries[delivery_id]
+            assert delivery.status != WebhookStatus.DELIVERED
+            assert "not JSON serializable" in delivery.error_message
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_publish_event_schedules_retry_for_failures(self, webhook_service):
+        """Test failed and raising deliveries are scheduled for retry."""
+        await self._create_endpoints(webhook_service, 2)
+        outcomes = iter([False, RuntimeError("boom")])
+
+        async def deliver(endpoint, delivery, json_prefix=None, filtered=False):
+            delivery.attempts += 1
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        webhook_service.delivery_engine.deliver_webhook = deliver
+
+        delivery_ids = await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"amount": 10}
+        )
+
+        assert len(delivery_ids) == 2
+        for delivery_id in delivery_ids:
+            assert webhook_service.registry.deliveries[delivery_id].status == WebhookStatus.RETRY
+        assert webhook_service.retry_task is not None
+
+        await webhook_service.shutdown()
+        assert webhook_service.retry_task is None
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_retry_loop_redelivers_due_retries_concurrently(self, webhook_service):
+        """Test the background loop picks up due retries without an external caller."""
+        for endpoint in await self._create_endpoints(webhook_service, 3):
+            endpoint.retry_interval_seconds = 0
+        in_flight = 0
+        max_in_flight = 0
+        retried = asyncio.Event()
+
+        async def deliver(endpoint, delivery, json_prefix=None, filtered=False):
+            nonlocal in_flight, max_in_flight
+            delivery.attempts += 1
+            if delivery.attempts == 1:
+                return False
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            delivery.status = WebhookStatus.DELIVERED
+            if all(d.status == WebhookStatus.DELIVERED
+                   for d in webhook_service.registry.deliveries.values()):
+                retried.set()
+            return True
+
+        webhook_service.delivery_engine.deliver_webhook = deliver
+
+        await webhook_service.publish_event(
+            WebhookEvent.TRANSACTION_CREATED, "user_123", {"amount": 10}
+        )
+        await asyncio.wait_for(retried.wait(), timeout=2)
+
+        assert max_in_flight == 3
+        assert len(webhook_service.retry_manager) == 0
+
+        await webhook_service.shutdown()
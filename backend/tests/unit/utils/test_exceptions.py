@@ -44,7 +44,7 @@ class TestExceptions:
         assert exc.message == "Simple error"
         assert exc.code == "UNKNOWN_ERROR"
         assert exc.status_code == 500
-        assert exc.details == []
+        assert exc.details == ()
     
     def test_validation_error(self):
         """Test ValidationError."""
@@ -181,4 +181,24 @@ class TestExceptions:
         assert exc.message == "Rate limit exceeded"
         assert exc.code == "RATE_LIMIT_ERROR"
         assert exc.status_code == 429
-        assert exc.details == []
\ No newline at end of file
+        assert exc.details == ()
+    
+    @pytest.mark.parametrize("exc_class", [
+        AppException,
+        ValidationError,
+        AuthenticationError,
+        AuthorizationError,
+        NotFoundError,
+        ConflictError,
+        BusinessLogicError,
+        DatabaseError,
+        ExternalServiceError,
+        RateLimitError
+    ])
+    def test_exceptions_use_slots(self, exc_class):
+        """Test exception fields live in slots rather than an instance dict."""
+        exc = exc_class("Error")
+        
+        assert "__slots__" in vars(exc_class)
+        assert exc.message == "Error"
+        assert exc.__dict__ == {}
@@ -10,9 +10,13 @@ from src.utils.validators import (
     validate_amount_centimos,
     validate_future_date,
     validate_hex_color,
+    validate_phone_number,
+    validate_password_strength,
+    validate_slug,
     validate_bank_last_four_digits,
     validate_amount_euros,
-    validate_percentage
+    validate_percentage,
+    validate_timezone
 )
 
 
@@ -145,12 +149,54 @@ class TestValidators:
     
     def test_validate_bank_last_four_digits_invalid(self):
         """Test bank digits validation with invalid values."""
-        invalid_digits = ["123", "12345", "ABCD", "12a4", ""]
+        invalid_digits = ["123", "12345", "ABCD", "12a4", "", "١٢٣٤", "12²4"]
         
         for digits in invalid_digits:
             with pytest.raises(ValueError, match="Must be exactly 4 digits"):
                 validate_bank_last_four_digits(digits)
     
+    def test_validate_phone_number(self):
+        """Test phone numbers are reduced to their digits."""
+        assert validate_phone_number("+34 (612) 345-678") == "34612345678"
+        assert validate_phone_number("612.345.678") == "612345678"
+        
+        for phone in ["123-456", "+1 234 567 890 123 456"]:
+            with pytest.raises(ValueError, match="between 7 and 15 digits"):
+                validate_phone_number(phone)
+    
+    def test_validate_password_strength_valid(self):
+        """Test password validation with strong passwords."""
+        for password in ["Passw0rd!", "Str0ng{Pass}", "aB3?aaaa", "Password\u0663!"]:
+            assert validate_password_strength(password) == password
+    
+    def test_validate_password_strength_invalid(self):
+        """Test password validation reports the first missing requirement."""
+        test_cases = [
+            ("Pa1!", "at least 8 characters"),
+            ("password1!", "uppercase letter"),
+            ("Éclair12!", "uppercase letter"),
+            ("PASSWORD1!", "lowercase letter"),
+            ("Password!!", "digit"),
+            ("Password12", "special character")
+        ]
+        
+        for password, message in test_cases:
+            with pytest.raises(ValueError, match=message):
+                validate_password_strength(password)
+    
+    def test_validate_slug_valid(self):
+        """Test slug validation with valid slugs."""
+        for slug in ["abc", "my-slug-1", " Travel-2024 "]:
+            assert validate_slug(slug) == slug.strip().lower()
+    
+    def test_validate_slug_invalid(self):
+        """Test slug validation with invalid slugs."""
+        invalid_slugs = ["-abc", "abc-", "a--b", "a_b", "ab", "a" * 51]
+        
+        for slug in invalid_slugs:
+            with pytest.raises(ValueError, match="Slug must"):
+                validate_slug(slug)
+    
     def test_validate_amount_euros_valid(self):
         """Test euro amount validation and conversion."""
         test_cases = [
@@ -166,11 +212,14 @@ class TestValidators:
     
     def test_validate_amount_euros_invalid(self):
         """Test euro amount validation with invalid values."""
-        invalid_amounts = [0, -1.0, -10.50]
+        invalid_amounts = [0, -1.0, -10.50, 0.001]
         
         for amount in invalid_amounts:
             with pytest.raises(ValueError, match="Amount must be positive"):
                 validate_amount_euros(amount)
+        
+        with pytest.raises(ValueError, match="Amount too large"):
+            validate_amount_euros(1_000_000_000.01)
     
     def test_validate_percentage_valid(self):
         """Test percentage validation with valid values."""
@@ -186,4 +235,13 @@ class TestValidators:
         
         for percentage in invalid_percentages:
             with pytest.raises(ValueError, match="Percentage must be between 0 and 100"):
-                validate_percentage(percentage)
\ No newline at end of file
+                validate_percentage(percentage)
+    
+    def test_validate_timezone(self):
+        """Test timezone validation accepts IANA names and rejects bare words."""
+        for timezone in ["Europe/Madrid", "UTC", "America/Argentina/Buenos_Aires"]:
+            assert validate_timezone(timezone) == timezone
+        
+        for timezone in ["Madrid", "not-a-zone"]:
+            with pytest.raises(ValueError, match="Invalid timezone format"):
+                validate_timezone(timezone)